@@ -0,0 +1,201 @@
+"""
+Stage-by-stage benchmark of the scoring engine.
+
+Each stage is timed call by call on a synthetic corpus (synthetic.py), first
+cold (empty caches, lazily built state reset) and then warm (the same inputs
+again, caches filled):
+
+- skills: ResumeJobScorer._extract_skills, per document
+- experience: ExperienceAnalyzer.extract_experience, per document
+- encode: SemanticMatcher.embed_documents, per document (warm = embedding store hits)
+- tfidf: SemanticMatcher._tfidf_similarity, per pair
+- score: ResumeJobScorer.score end to end, per pair (warm = result cache hits)
+
+Reports p50/p95/p99/mean latency, throughput and the process's peak RSS
+after each phase, and writes everything as JSON so runs can be compared
+across commits:
+
+    python benchmark.py --resumes 200 --words 300 --output bench.json
+    python benchmark.py --resumes 200 --words 300 --compare bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+import synthetic
+from caching import EmbeddingStore, ProfileStore, ResultCache
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('skills', 'experience', 'encode', 'tfidf', 'score')
+
+# Slowdown of a stage's p95 against the baseline that --compare reports as a regression
+REGRESSION_RATIO = 1.2
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def summarize(latencies_s: Sequence[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds and calls per second"""
+    latencies = np.asarray(latencies_s) * 1000
+    return {
+        'calls': len(latencies),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'mean_ms': round(float(latencies.mean()), 3),
+        'throughput_per_s': round(len(latencies) / (latencies.sum() / 1000), 1) if latencies.sum() else None,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def time_calls(fn: Callable[[Any], Any], inputs: Sequence[Any]) -> List[float]:
+    """Wall time of fn(item) for each item, in seconds"""
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(resumes: int = 200, jobs: int = 20, words: int = 300, job_words: int = 150,
+        seed: int = 0, stages: Sequence[str] = STAGES) -> Dict[str, Any]:
+    """Benchmark the given stages and return the report"""
+    from scoring import ExperienceAnalyzer, ResumeJobScorer
+
+    pairs = synthetic.generate_pairs(resumes, words, job_words, jobs, seed)
+    documents = [resume for resume, _, _ in pairs] + sorted({job for _, job, _ in pairs})
+
+    load_start = time.perf_counter()
+    # Private in-memory stores, so neither earlier runs nor the server's caches leak in
+    scorer = ResumeJobScorer(cache=ResultCache(max_entries=len(pairs) + 1), profile_store=ProfileStore(None))
+    matcher = scorer.semantic_matcher
+    matcher.embedding_store = EmbeddingStore()
+    model_load_s = time.perf_counter() - load_start
+
+    def reset():
+        scorer.cache.clear()
+        matcher.embedding_store = EmbeddingStore()
+        matcher.tfidf = None
+
+    stage_calls = {
+        'skills': (scorer._extract_skills, documents),
+        'experience': (ExperienceAnalyzer.extract_experience, documents),
+        'encode': (lambda text: matcher.embed_documents([text]), documents),
+        'tfidf': (lambda pair: matcher._tfidf_similarity(pair[0], pair[1]), pairs),
+        'score': (lambda pair: scorer.score(*pair), pairs)
+    }
+
+    results = {}
+    for stage in stages:
+        if stage == 'encode' and not matcher.encoder:
+            logger.warning("No encoder loaded; skipping the encode stage")
+            continue
+        fn, inputs = stage_calls[stage]
+        reset()
+        cold = summarize(time_calls(fn, inputs))
+        warm = summarize(time_calls(fn, inputs))
+        results[stage] = {'cold': cold, 'warm': warm}
+        logger.info(f"{stage}: cold p50 {cold['p50_ms']}ms p95 {cold['p95_ms']}ms, "
+                    f"warm p50 {warm['p50_ms']}ms p95 {warm['p95_ms']}ms")
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'encoder': matcher.encoder.name if matcher.encoder else None,
+            'model_load_s': round(model_load_s, 2)
+        },
+        'config': {
+            'resumes': resumes, 'jobs': jobs, 'words': words, 'job_words': job_words,
+            'seed': seed, 'documents': len(documents), 'pairs': len(pairs)
+        },
+        'stages': results
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = REGRESSION_RATIO) -> List[str]:
+    """Print current/baseline latency ratios per stage and phase; returns the regressions"""
+    if report['config'] != baseline.get('config'):
+        print("warning: corpus configuration differs from the baseline", file=sys.stderr)
+
+    regressions = []
+    print(f"{'stage':<12}{'phase':<6}{'p50 ratio':>10}{'p95 ratio':>10}")
+    for stage, phases in report['stages'].items():
+        for phase, current in phases.items():
+            before = baseline.get('stages', {}).get(stage, {}).get(phase)
+            if not before:
+                continue
+            ratios = [current[key] / before[key] if before[key] else float('nan') for key in ('p50_ms', 'p95_ms')]
+            print(f"{stage:<12}{phase:<6}{ratios[0]:>10.2f}{ratios[1]:>10.2f}")
+            if ratios[1] > threshold:
+                regressions.append(f"{stage}/{phase}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-stage latency/throughput/memory benchmark")
+    parser.add_argument('--resumes', type=int, default=200, help="Resumes (and so pairs) in the corpus")
+    parser.add_argument('--jobs', type=int, default=20, help="Distinct job descriptions")
+    parser.add_argument('--words', type=int, default=300, help="Approximate resume length")
+    parser.add_argument('--job-words', type=int, default=150, help="Approximate job description length")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=STAGES)
+    parser.add_argument('--output', help="Write the JSON report here (default: stdout)")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO,
+                        help="p95 ratio above which --compare exits non-zero")
+    args = parser.parse_args(argv)
+
+    report = run(args.resumes, args.jobs, args.words, args.job_words, args.seed, args.stages)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressed (p95 > {args.threshold}x baseline): {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,456 @@
+"""
+Caching layers for the scoring engine.
+
+- EmbeddingStore: content hash -> float32 embedding, persisted in a
+  memory-mapped .npy arena so documents are only ever encoded once
+- ResultCache: bounded LRU/TTL cache for scoring results with hit/miss metrics
+- ProfileStore: JSON documents (resume/job profiles) persisted by kind and ID
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, so one writer per store directory
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore:
+    """
+    Per-document embedding cache keyed by content hash
+
+    With a directory, vectors live in `<namespace>.vectors.npy` (a memory-mapped
+    arena that doubles in size when full) and keys in `<namespace>.index`, an
+    append-only file whose line N names arena row N. Rows are flushed before
+    their keys are appended, so a crash can only lose entries, never corrupt them.
+    Without a directory the store is a plain in-memory dict.
+
+    Several processes may share a directory (uvicorn --workers, a benchmark
+    next to the server): appends hold an flock on `<namespace>.lock` and first
+    replay index lines other processes added, so rows never collide, and
+    lookups that miss pick up other processes' new rows. Where fcntl is
+    unavailable (Windows) a directory must have a single writer process.
+    Forked scoring workers call `make_read_only()` so their new vectors stay
+    in a per-process overlay.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, directory: Optional[str] = None, namespace: str = "default"):
+        self.namespace = re.sub(r'[^A-Za-z0-9_.-]', '_', namespace)
+        self.directory = Path(directory) if directory else None
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._memory: Dict[str, np.ndarray] = {}
+        self._arena: Optional[np.memmap] = None
+        self._arena_inode: Optional[int] = None
+        self._index_lines = 0   # Index lines replayed so far (= arena rows in use)
+        self._index_offset = 0  # Bytes of the index replayed so far
+        self._overlay: Optional["ResultCache"] = None
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    @staticmethod
+    def content_key(text: str) -> str:
+        """Stable hash of document content"""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / f"{self.namespace}.vectors.npy"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.directory / f"{self.namespace}.index"
+
+    @property
+    def _lock_path(self) -> Path:
+        return self.directory / f"{self.namespace}.lock"
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock across every process writing to this store directory"""
+        with open(self._lock_path, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self):
+        """Open an existing arena and replay its key index"""
+        with self._file_lock():
+            if not self._vectors_path.exists() and self._index_path.exists():
+                # An index without its arena points at nothing
+                self._index_path.unlink()
+            self._sync()
+        if self._rows:
+            logger.info(f"Loaded {len(self._rows)} cached embeddings from {self._vectors_path}")
+
+    def _sync(self):
+        """Replay index lines appended since the last sync, by this or other processes"""
+        # Keys before the arena: their rows were flushed before they were
+        # appended, so an arena opened afterwards always holds them
+        if self._index_path.exists():
+            with open(self._index_path, 'rb') as f:
+                f.seek(self._index_offset)
+                tail = f.read()
+            complete = tail.rfind(b'\n') + 1  # A line still being written is left for later
+            for key in tail[:complete].decode('ascii').splitlines():
+                self._rows.setdefault(key, self._index_lines)
+                self._index_lines += 1
+            self._index_offset += complete
+
+        # Another process may have grown the arena into a new file
+        if self._vectors_path.exists():
+            inode = os.stat(self._vectors_path).st_ino
+            if inode != self._arena_inode:
+                self._arena = np.load(self._vectors_path, mmap_mode='r+')
+                self._arena_inode = inode
+
+    def _index_grew(self) -> bool:
+        try:
+            return os.stat(self._index_path).st_size > self._index_offset
+        except FileNotFoundError:
+            return False
+
+    def make_read_only(self, overlay_entries: int = 10000):
+        """Stop writing to the shared store; later puts go to a bounded in-process overlay"""
+        with self._lock:
+            self._overlay = ResultCache(max_entries=overlay_entries)
+
+    @property
+    def read_only(self) -> bool:
+        return self._overlay is not None
+
+    def __len__(self) -> int:
+        return len(self._rows) if self.directory is not None else len(self._memory)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows or key in self._memory
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return the stored vectors for whichever keys are present"""
+        with self._lock:
+            if self.directory is None:
+                found = {key: self._memory[key] for key in keys if key in self._memory}
+            else:
+                if any(key not in self._rows for key in keys) and self._index_grew():
+                    self._sync()
+                found = {}
+                for key in keys:
+                    row = self._rows.get(key)
+                    if row is not None and row < len(self._arena):
+                        found[key] = np.array(self._arena[row])
+
+            if self._overlay is not None:
+                for key in keys:
+                    if key not in found:
+                        vector = self._overlay.get(key)
+                        if vector is not None:
+                            found[key] = vector
+            return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Store vectors for keys that are not already present"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        with self._lock:
+            if self._overlay is not None:
+                for key, vector in zip(keys, vectors):
+                    if key not in self._rows and key not in self._memory:
+                        self._overlay.put(key, vector.copy())
+                return
+
+            if self.directory is None:
+                for key, vector in zip(keys, vectors):
+                    self._memory.setdefault(key, vector.copy())
+                return
+
+            with self._file_lock():
+                # Rows other processes appended since our last look are taken
+                self._sync()
+                new_keys, new_vectors, seen = [], [], set()
+                for key, vector in zip(keys, vectors):
+                    if key not in self._rows and key not in seen:
+                        seen.add(key)
+                        new_keys.append(key)
+                        new_vectors.append(vector)
+                if not new_keys:
+                    return
+
+                start = self._index_lines
+                self._reserve(start + len(new_keys), vectors.shape[1])
+                self._arena[start:start + len(new_keys)] = np.stack(new_vectors)
+                self._arena.flush()
+
+                lines = ''.join(f"{key}\n" for key in new_keys).encode('ascii')
+                with open(self._index_path, 'ab') as f:
+                    f.write(lines)
+                for offset, key in enumerate(new_keys):
+                    self._rows[key] = start + offset
+                self._index_lines += len(new_keys)
+                self._index_offset += len(lines)
+
+    def _reserve(self, rows: int, dim: int):
+        """Make sure the arena can hold `rows` vectors, doubling it if needed"""
+        if self._arena is not None:
+            if self._arena.shape[1] != dim:
+                raise ValueError(
+                    f"Embedding dimension {dim} does not match store dimension {self._arena.shape[1]}"
+                )
+            if rows <= len(self._arena):
+                return
+
+        capacity = max(self.INITIAL_CAPACITY, len(self._arena) if self._arena is not None else 0)
+        while capacity < rows:
+            capacity *= 2
+
+        tmp_path = self._vectors_path.with_suffix('.tmp.npy')
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(capacity, dim))
+        used = self._index_lines
+        if used:
+            grown[:used] = self._arena[:used]
+        grown.flush()
+        del grown
+
+        self._arena = None
+        os.replace(tmp_path, self._vectors_path)
+        self._arena = np.load(self._vectors_path, mmap_mode='r+')
+        self._arena_inode = os.stat(self._vectors_path).st_ino
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate deep memory footprint of an object in bytes"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, Enum)) or obj is None:
+        return size
+    if isinstance(obj, np.ndarray):
+        return size if obj.base is None else size + obj.nbytes
+    if isinstance(obj, dict):
+        return size + sum(
+            estimate_size(key, _seen) + estimate_size(value, _seen) for key, value in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _seen) for item in obj)
+    if is_dataclass(obj):
+        return size + sum(estimate_size(getattr(obj, f.name), _seen) for f in fields(obj))
+    if hasattr(obj, '__dict__'):
+        return size + estimate_size(vars(obj), _seen)
+    return size
+
+
+class ResultCache:
+    """
+    Bounded LRU cache for scoring results
+
+    Entries are evicted least-recently-used first once either `max_entries` or
+    `max_bytes` (estimated deep size) is exceeded, and expire after
+    `ttl_seconds` when set. Keys are content hashes, so an evicted or expired
+    entry recomputes to the same deterministic result.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = estimate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        # key -> (value, size_bytes, expires_at)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls, prefix: str = "RESULT_CACHE") -> "ResultCache":
+        """Build a cache from <PREFIX>_MAX_ENTRIES, _MAX_BYTES and _TTL_SECONDS"""
+        ttl = os.environ.get(f"{prefix}_TTL_SECONDS")
+        return cls(
+            max_entries=int(os.environ.get(f"{prefix}_MAX_ENTRIES", 10000)),
+            max_bytes=int(os.environ.get(f"{prefix}_MAX_BYTES", 256 * 1024 * 1024)),
+            ttl_seconds=float(ttl) if ttl else None
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a key, counting the hit or miss and refreshing its recency"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, size, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        """Insert or replace an entry, then evict down to the configured bounds"""
+        size = self._sizeof(value)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            # Values bigger than the whole budget are never worth caching
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def discard(self, key: str) -> bool:
+        """Drop one entry if present; returns whether it was"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or time.monotonic() < entry[2])
+
+    def __getitem__(self, key: str) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.put(key, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drop all entries; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size, bounds and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class ProfileStore:
+    """
+    Persists serialized profiles as one JSON file per (kind, id)
+
+    Files are named by a hash of the ID so any ID string is safe to use, and
+    are written atomically. A recently-used window of loaded documents is
+    kept in memory. Without a directory documents live in memory only, all of
+    them: that dict is the store, so nothing is ever evicted from it.
+    """
+
+    def __init__(self, directory: Optional[str] = None, memory_entries: int = 1000):
+        self.directory = Path(directory) if directory else None
+        self._memory = ResultCache(max_entries=memory_entries) if self.directory else {}
+
+    def _path(self, kind: str, item_id: str) -> Path:
+        digest = hashlib.sha1(item_id.encode('utf-8')).hexdigest()
+        return self.directory / kind / f"{digest}.json"
+
+    def save(self, kind: str, item_id: str, document: Dict[str, Any]):
+        """Store a document, replacing any previous version"""
+        self._memory[f"{kind}:{item_id}"] = document
+        if self.directory is None:
+            return
+
+        path = self._path(kind, item_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(document, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, kind: str, item_id: str) -> bool:
+        """Remove a document; returns whether it existed"""
+        if self.directory is None:
+            return self._memory.pop(f"{kind}:{item_id}", None) is not None
+
+        existed = self._memory.discard(f"{kind}:{item_id}")
+        path = self._path(kind, item_id)
+        if path.exists():
+            path.unlink()
+            existed = True
+        return existed
+
+    def load(self, kind: str, item_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a document, or None if it was never stored"""
+        document = self._memory.get(f"{kind}:{item_id}")
+        if document is not None or self.directory is None:
+            return document
+
+        path = self._path(kind, item_id)
+        if not path.exists():
+            return None
+        with open(path, 'r') as f:
+            document = json.load(f)
+        self._memory[f"{kind}:{item_id}"] = document
+        return document
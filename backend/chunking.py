@@ -0,0 +1,165 @@
+"""
+Document chunking for long resumes and job descriptions.
+
+The sentence encoder truncates its input (384 tokens for mpnet), so documents
+longer than one window are split into section-aligned chunks, each chunk is
+embedded on its own, and the chunk vectors are pooled back into one document
+vector. Job descriptions are also split into requirement lines for
+chunk-level max-sim matching.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Roughly 384 word-piece tokens of typical resume English
+CHUNK_MAX_WORDS = 250
+
+# Relative importance of each section in weighted pooling
+SECTION_WEIGHTS = {
+    'experience': 1.5,
+    'skills': 1.3,
+    'projects': 1.2,
+    'requirements': 1.3,
+    'summary': 1.0,
+    'other': 1.0,
+    'education': 0.8
+}
+
+SECTION_HEADINGS = {
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'skills': ('skills', 'technical skills', 'technologies', 'core competencies', 'tech stack'),
+    'projects': ('projects', 'personal projects', 'selected projects'),
+    'education': ('education', 'certifications', 'education and certifications'),
+    'summary': ('summary', 'profile', 'objective', 'about', 'about me', 'professional summary'),
+    'requirements': ('requirements', 'qualifications', 'minimum qualifications',
+                     'preferred qualifications', 'what you bring', 'must have', 'nice to have',
+                     'responsibilities', 'what you will do')
+}
+
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items()
+                   for heading in headings}
+
+POOLING_MODES = ('mean', 'max', 'weighted')
+
+# Requirement lines matched per job
+MAX_REQUIREMENT_LINES = 30
+
+_SENTENCE_END = re.compile(r'(?<=[.!?;])\s+')
+_BULLET = re.compile(r'^\s*(?:[-*•▪◦‣]|\d+[.)])\s*')
+
+
+@dataclass
+class Chunk:
+    text: str
+    section: str
+    word_count: int
+
+    @property
+    def weight(self) -> float:
+        return SECTION_WEIGHTS.get(self.section, 1.0) * self.word_count
+
+
+def needs_chunking(text: str, max_words: int = CHUNK_MAX_WORDS) -> bool:
+    """Whether a document is longer than one encoder window"""
+    return len(text.split()) > max_words
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split on recognised headings into (section, body) pairs, in document order"""
+    sections, section, lines = [], 'other', []
+    for line in text.splitlines():
+        heading = re.sub(r'[^a-z ]', '', line.lower()).strip()
+        if heading in _HEADING_LOOKUP and len(line.split()) <= 4:
+            if lines:
+                sections.append((section, '\n'.join(lines)))
+            section, lines = _HEADING_LOOKUP[heading], []
+        else:
+            lines.append(line)
+    if lines:
+        sections.append((section, '\n'.join(lines)))
+    return sections
+
+
+def _sentences(text: str, max_words: int) -> List[str]:
+    """Sentences (and bullet lines) of text, hard-split if longer than max_words"""
+    pieces = []
+    for line in text.splitlines():
+        for sentence in _SENTENCE_END.split(line.strip()):
+            words = sentence.split()
+            for start in range(0, len(words), max_words):
+                pieces.append(' '.join(words[start:start + max_words]))
+    return [piece for piece in pieces if piece]
+
+
+def split_into_chunks(text: str, max_words: int = CHUNK_MAX_WORDS) -> List[Chunk]:
+    """
+    Split a document into chunks of at most max_words
+
+    Each section that fits is one chunk; longer sections become consecutive
+    sentence windows. Chunks never span sections, so editing one section leaves
+    the other chunks (and their cached embeddings) unchanged.
+    """
+    chunks = []
+    for section, body in split_sections(text):
+        words = body.split()
+        if not words:
+            continue
+        if len(words) <= max_words:
+            chunks.append(Chunk(' '.join(words), section, len(words)))
+            continue
+
+        window, count = [], 0
+        for sentence in _sentences(body, max_words):
+            size = len(sentence.split())
+            if window and count + size > max_words:
+                chunks.append(Chunk(' '.join(window), section, count))
+                window, count = [], 0
+            window.append(sentence)
+            count += size
+        if window:
+            chunks.append(Chunk(' '.join(window), section, count))
+
+    return chunks or [Chunk(text.strip(), 'other', len(text.split()))]
+
+
+def pool(vectors: np.ndarray, chunks: Sequence[Chunk], mode: str = 'weighted') -> np.ndarray:
+    """Combine chunk embeddings into one unit-length document vector"""
+    if mode == 'max':
+        pooled = vectors.max(axis=0)
+    elif mode == 'mean':
+        pooled = vectors.mean(axis=0)
+    elif mode == 'weighted':
+        weights = np.array([chunk.weight for chunk in chunks], dtype=np.float32)
+        pooled = (vectors * weights[:, None]).sum(axis=0) / weights.sum()
+    else:
+        raise ValueError(f"Unknown pooling mode '{mode}' (expected one of {', '.join(POOLING_MODES)})")
+
+    norm = np.linalg.norm(pooled)
+    return (pooled / norm if norm > 0 else pooled).astype(np.float32)
+
+
+def requirement_lines(job_text: str, limit: int = MAX_REQUIREMENT_LINES) -> List[str]:
+    """
+    Individual requirements of a job description
+
+    Lines under a requirements-style heading when there is one, otherwise
+    every line/sentence; bullets are stripped and fragments under 3 words skipped.
+    """
+    sections = split_sections(job_text)
+    requirements = [body for section, body in sections if section == 'requirements']
+    source = '\n'.join(requirements) if requirements else job_text
+
+    lines, seen = [], set()
+    for line in source.splitlines():
+        for sentence in _SENTENCE_END.split(_BULLET.sub('', line).strip()):
+            sentence = sentence.strip()
+            if len(sentence.split()) >= 3 and sentence.lower() not in seen:
+                seen.add(sentence.lower())
+                lines.append(sentence)
+                if len(lines) >= limit:
+                    return lines
+    return lines
@@ -0,0 +1,297 @@
+"""
+Pluggable text encoder backends for SemanticMatcher.
+
+- TorchEncoder: sentence-transformers on PyTorch (fp32), the reference
+- OnnxEncoder: the same transformer exported to ONNX and run on ONNX Runtime,
+  optionally with dynamic int8 weight quantization; the export is cached
+  locally so it happens once per model
+
+Select with ENCODER_BACKEND=torch|onnx|onnx-int8. Run
+`python encoders.py benchmark` to compare speed and embedding parity.
+"""
+
+import abc
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Exported/quantized ONNX models, one subdirectory per model
+DEFAULT_ONNX_CACHE_DIR = str(Path(__file__).parent / '.onnx_cache')
+
+# Largest acceptable 1 - cosine between a backend's embedding and torch's
+PARITY_TOLERANCE = 0.01
+
+
+class EncoderBackend(abc.ABC):
+    """Turns texts into float32 embeddings, one row per text"""
+
+    name = "base"
+
+    @abc.abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Embed texts as a (len(texts), dim) float32 array"""
+
+
+class TorchEncoder(EncoderBackend):
+    """sentence-transformers model on PyTorch"""
+
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        embeddings = self.model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+        return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+
+
+class OnnxEncoder(EncoderBackend):
+    """
+    Transformer exported to ONNX, with pooling and normalization done in numpy
+
+    The first use exports `<cache_dir>/<model>/model.onnx` from the
+    sentence-transformers model (plus its tokenizer and pooling settings) and,
+    when `quantize` is set, writes `model.int8.onnx` with int8 weights via
+    onnxruntime's dynamic quantization. Later loads need neither torch nor
+    sentence-transformers.
+    """
+
+    def __init__(self, model_name: str, cache_dir: Optional[str] = None, quantize: bool = True):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.name = "onnx-int8" if quantize else "onnx"
+        self.directory = Path(cache_dir or os.environ.get('ONNX_CACHE_DIR', DEFAULT_ONNX_CACHE_DIR)) / \
+            re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+
+        model_path = self._ensure_exported()
+        with open(self.directory / 'encoder.json', 'r') as f:
+            self.config = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.directory))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=['CPUExecutionProvider']
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def _ensure_exported(self) -> Path:
+        """Path of the model to load, exporting and quantizing on first use"""
+        fp32_path = self.directory / 'model.onnx'
+        if not fp32_path.exists():
+            self._export(fp32_path)
+        if not self.quantize:
+            return fp32_path
+
+        int8_path = self.directory / 'model.int8.onnx'
+        if not int8_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            logger.info(f"Quantizing {fp32_path} to int8")
+            tmp_path = int8_path.with_suffix('.tmp.onnx')
+            quantize_dynamic(str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8)
+            os.replace(tmp_path, int8_path)
+        return int8_path
+
+    def _export(self, path: Path):
+        """Export the sentence-transformers model's transformer to ONNX"""
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        logger.info(f"Exporting {self.model_name} to ONNX at {path}")
+        st_model = SentenceTransformer(self.model_name, device='cpu')
+        transformer, pooling = st_model[0], st_model[1]
+        normalize = any(type(module).__name__ == 'Normalize' for module in st_model)
+
+        class _HiddenStates(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sample = transformer.tokenizer(["export sample"], return_tensors='pt')
+        tmp_path = path.with_suffix('.tmp.onnx')
+        with torch.no_grad():
+            torch.onnx.export(
+                _HiddenStates(transformer.auto_model.eval()),
+                (sample['input_ids'], sample['attention_mask']),
+                str(tmp_path),
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['last_hidden_state'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'last_hidden_state': {0: 'batch', 1: 'sequence'}
+                },
+                opset_version=14
+            )
+
+        transformer.tokenizer.save_pretrained(str(self.directory))
+        with open(self.directory / 'encoder.json', 'w') as f:
+            json.dump({
+                'max_seq_length': st_model.max_seq_length,
+                'pooling': pooling.get_pooling_mode_str(),
+                'normalize': normalize
+            }, f)
+        # Written last: its presence marks a complete export
+        os.replace(tmp_path, path)
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Similar lengths per batch keep padding (and wasted compute) low
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            batches.append(self._encode_batch(batch))
+        embeddings = np.concatenate(batches)
+
+        result = np.empty_like(embeddings)
+        result[order] = embeddings
+        return result
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        tokens = self.tokenizer(
+            texts, padding=True, truncation=True,
+            max_length=self.config['max_seq_length'], return_tensors='np'
+        )
+        feeds = {name: tokens[name].astype(np.int64) for name in self._input_names}
+        hidden = self.session.run(None, feeds)[0]
+        return pool_hidden_states(hidden, tokens['attention_mask'], self.config['pooling'], self.config['normalize'])
+
+
+def pool_hidden_states(hidden: np.ndarray, attention_mask: np.ndarray,
+                       pooling: str = 'mean', normalize: bool = True) -> np.ndarray:
+    """Token states (batch, tokens, dim) to one vector per text, as sentence-transformers pools them"""
+    mask = attention_mask[..., None].astype(np.float32)
+    if pooling == 'cls':
+        pooled = hidden[:, 0]
+    elif pooling == 'max':
+        pooled = np.where(mask > 0, hidden, -1e9).max(axis=1)
+    else:
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    if normalize:
+        pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return pooled.astype(np.float32)
+
+
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+
+def create_encoder(backend: Optional[str], model_name: str) -> EncoderBackend:
+    """Build the named backend (default: ENCODER_BACKEND, else torch)"""
+    backend = (backend or os.environ.get('ENCODER_BACKEND') or 'torch').lower()
+    if backend == 'torch':
+        return TorchEncoder(model_name)
+    if backend in ('onnx', 'onnx-int8'):
+        return OnnxEncoder(model_name, quantize=backend == 'onnx-int8')
+    raise ValueError(f"Unknown encoder backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+
+
+def check_parity(reference: np.ndarray, candidate: np.ndarray,
+                 tolerance: float = PARITY_TOLERANCE) -> Dict[str, float]:
+    """Cosine drift (1 - cosine) between two backends' embeddings of the same texts"""
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    drift = 1.0 - np.sum(reference * candidate, axis=1)
+    return {
+        'mean_drift': float(drift.mean()),
+        'max_drift': float(drift.max()),
+        'tolerance': tolerance,
+        'passed': bool(drift.max() < tolerance)
+    }
+
+
+def _benchmark_texts(count: int) -> List[str]:
+    """Resume/job-like texts of varied length"""
+    skills = ['Python', 'Django', 'React', 'AWS', 'Kubernetes', 'PostgreSQL', 'machine learning',
+              'TypeScript', 'Docker', 'Terraform', 'Spark', 'Go', 'Java', 'GraphQL']
+    texts = []
+    for i in range(count):
+        picked = [skills[(i * 7 + j * 3) % len(skills)] for j in range(3 + i % 5)]
+        sentences = [
+            f"Software engineer with {2 + i % 12} years of experience building services in {', '.join(picked)}.",
+            f"Led a team of {1 + i % 6} engineers and designed data pipelines processing {10 * (i + 1)}k events per day.",
+            "Implemented CI/CD, monitoring and on-call practices; mentored junior developers."
+        ]
+        texts.append(' '.join(sentences * (1 + i % 4)))
+    return texts
+
+
+def _time_encode(encoder: EncoderBackend, texts: List[str], batch_size: int, repeats: int) -> float:
+    """Best-of-N wall time for encoding all texts"""
+    encoder.encode(texts[:batch_size], batch_size)  # Warm-up
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encoder.encode(texts, batch_size)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export, parity-check and benchmark encoder backends")
+    parser.add_argument('command', choices=['export', 'benchmark'])
+    parser.add_argument('--model', default='all-mpnet-base-v2')
+    parser.add_argument('--backends', nargs='+', default=['onnx-int8'], choices=BACKENDS,
+                        help="Backends to compare against torch")
+    parser.add_argument('--texts', type=int, default=256)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        for backend in args.backends:
+            if backend != 'torch':
+                create_encoder(backend, args.model)
+                print(f"{backend}: ready")
+        return 0
+
+    texts = _benchmark_texts(args.texts)
+    reference = create_encoder('torch', args.model)
+    reference_embeddings = reference.encode(texts, args.batch_size)
+    reference_time = _time_encode(reference, texts, args.batch_size, args.repeats)
+    report = {'torch': {'seconds': reference_time, 'texts_per_second': len(texts) / reference_time}}
+
+    ok = True
+    for backend in args.backends:
+        if backend == 'torch':
+            continue
+        encoder = create_encoder(backend, args.model)
+        parity = check_parity(reference_embeddings, encoder.encode(texts, args.batch_size))
+        seconds = _time_encode(encoder, texts, args.batch_size, args.repeats)
+        report[backend] = {
+            'seconds': seconds,
+            'texts_per_second': len(texts) / seconds,
+            'speedup': reference_time / seconds,
+            **parity
+        }
+        ok = ok and parity['passed']
+
+    print(json.dumps(report, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
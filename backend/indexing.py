@@ -0,0 +1,396 @@
+"""
+Vector indexes for top-K retrieval over stored profiles.
+
+- VectorIndex: cosine-similarity index over embeddings; exact (flat) scan
+  until it grows large enough, then an IVF layout (spherical k-means lists,
+  probing only the closest lists per query). Persisted append-only to local files.
+- AttributeIndex: inverted index from canonical skill to IDs plus years of
+  experience per ID, for cheap prefiltering before vector retrieval
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so dot products are cosine similarities"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorIndex:
+    """
+    Cosine top-K index keyed by string ID (CPU only)
+
+    Below TRAIN_THRESHOLD live vectors every query is an exact scan. Past it,
+    vectors are clustered into ~4*sqrt(n) lists with spherical k-means and a
+    query only scores rows in its `n_probe` nearest lists. Lists are retrained
+    in a background thread whenever the index has doubled since the last
+    training; searches keep using the previous lists (or the exact scan) until
+    the new ones are swapped in.
+
+    With a directory, vectors are appended to `<name>.vectors.f32` and IDs to
+    `<name>.ids.log` ("+id" per added row, "-id" per removal), so every change
+    is durable without rewriting the index. Centroids go to `<name>.centroids.npy`.
+    """
+
+    TRAIN_THRESHOLD = 20000
+    EXACT_FILTER_LIMIT = 50000  # Filters up to this size are scored exactly
+    KMEANS_ITERATIONS = 10
+    KMEANS_SAMPLE = 50000
+
+    def __init__(self, directory: Optional[str] = None, name: str = "vectors", n_probe: int = 32):
+        self.directory = Path(directory) if directory else None
+        self.name = name
+        self.n_probe = n_probe
+        self._lock = threading.RLock()
+
+        self._vectors = np.zeros((0, 0), dtype=np.float32)  # Capacity rows, first _count used
+        self._count = 0
+        self._ids: List[str] = []                           # Row -> ID
+        self._live = np.zeros(0, dtype=bool)                # Row still current (not removed/replaced)
+        self._rows: Dict[str, int] = {}                     # Live ID -> row
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)     # Row -> IVF list
+        self._trained_at = 0
+        self._trainer: Optional[threading.Thread] = None
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    # ------------------------------------------------------------------ storage
+
+    def _file(self, suffix: str) -> Path:
+        return self.directory / f"{self.name}{suffix}"
+
+    def _load(self):
+        """Replay the vector file and ID log"""
+        meta_path = self._file('.meta.json')
+        if not meta_path.exists():
+            return
+
+        dim = json.loads(meta_path.read_text())['dim']
+        vectors = np.fromfile(self._file('.vectors.f32'), dtype=np.float32)
+        vectors = vectors[:len(vectors) // dim * dim].reshape(-1, dim)
+
+        row = 0
+        with open(self._file('.ids.log'), 'r') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # Torn final write
+                op, item_id = line[0], json.loads(line[1:])
+                if op == '+':
+                    if row >= len(vectors):
+                        break
+                    self._append_row(item_id, vectors[row])
+                    row += 1
+                elif item_id in self._rows:
+                    self._live[self._rows.pop(item_id)] = False
+
+        centroids_path = self._file('.centroids.npy')
+        if centroids_path.exists() and self._count:
+            self._set_centroids(np.load(centroids_path))
+
+        logger.info(f"Loaded {len(self._rows)} vectors into index '{self.name}'")
+
+    def _log(self, lines: List[str], vectors: Optional[np.ndarray] = None):
+        """Append vectors, then the ID lines that make them visible"""
+        if self.directory is None:
+            return
+        if vectors is not None:
+            meta_path = self._file('.meta.json')
+            if not meta_path.exists():
+                meta_path.write_text(json.dumps({'dim': int(vectors.shape[1])}))
+            with open(self._file('.vectors.f32'), 'ab') as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self._file('.ids.log'), 'a') as f:
+            f.write(''.join(lines))
+
+    # ------------------------------------------------------------------ mutation
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def _append_row(self, item_id: str, vector: np.ndarray):
+        if self._count == len(self._vectors):
+            capacity = max(1024, 2 * len(self._vectors))
+            grown = np.zeros((capacity, len(vector)), dtype=np.float32)
+            if self._count:
+                grown[:self._count] = self._vectors[:self._count]
+            self._vectors = grown
+            assignments = np.zeros(capacity, dtype=np.int32)
+            assignments[:self._count] = self._assignments[:self._count]
+            self._assignments = assignments
+            live = np.zeros(capacity, dtype=bool)
+            live[:self._count] = self._live[:self._count]
+            self._live = live
+
+        if item_id in self._rows:
+            self._live[self._rows[item_id]] = False
+        self._vectors[self._count] = vector
+        self._live[self._count] = True
+        if self._centroids is not None:
+            self._assignments[self._count] = int(np.argmax(self._centroids @ vector))
+        self._ids.append(item_id)
+        self._rows[item_id] = self._count
+        self._count += 1
+
+    def add(self, ids: List[str], vectors: np.ndarray):
+        """Add or replace vectors by ID"""
+        vectors = _normalize(np.atleast_2d(vectors))
+        with self._lock:
+            if self._count and vectors.shape[1] != self._vectors.shape[1]:
+                raise ValueError(
+                    f"Vector dimension {vectors.shape[1]} does not match index dimension {self._vectors.shape[1]}"
+                )
+            self._log([f"+{json.dumps(item_id)}\n" for item_id in ids], vectors)
+            for item_id, vector in zip(ids, vectors):
+                self._append_row(item_id, vector)
+
+            live = len(self._rows)
+            if live >= self.TRAIN_THRESHOLD and live >= 2 * self._trained_at and self._trainer is None:
+                self._trainer = threading.Thread(
+                    target=self._train_in_background, name=f"train-{self.name}", daemon=True
+                )
+                self._trainer.start()
+
+    def remove(self, ids: Iterable[str]):
+        """Drop IDs from the index (unknown IDs are ignored)"""
+        with self._lock:
+            removed = [item_id for item_id in ids if item_id in self._rows]
+            self._log([f"-{json.dumps(item_id)}\n" for item_id in removed])
+            for item_id in removed:
+                self._live[self._rows.pop(item_id)] = False
+
+    def vector(self, item_id: str) -> Optional[np.ndarray]:
+        """Stored (normalized) vector for an ID"""
+        row = self._rows.get(item_id)
+        return None if row is None else self._vectors[row].copy()
+
+    # ------------------------------------------------------------------ IVF
+
+    def train(self, n_lists: Optional[int] = None):
+        """
+        Cluster live vectors into IVF lists with spherical k-means
+
+        Clustering and list assignment run on a snapshot of the rows without
+        holding the lock, so adds and searches carry on meanwhile; only rows
+        added since the snapshot are assigned while the new lists are swapped in.
+        """
+        with self._lock:
+            live_rows = np.fromiter(self._rows.values(), dtype=np.int64)
+            # Rows are never rewritten in place, so this array's first `count` rows stay valid
+            vectors, count = self._vectors, self._count
+        if len(live_rows) == 0:
+            return
+        n_lists = n_lists or max(1, int(4 * np.sqrt(len(live_rows))))
+        n_lists = min(n_lists, len(live_rows))
+
+        rng = np.random.default_rng(0)  # Deterministic lists for reproducible results
+        sample = vectors[rng.choice(
+            live_rows, size=min(len(live_rows), max(self.KMEANS_SAMPLE, n_lists)), replace=False
+        )]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+
+        for _ in range(self.KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for list_id in range(n_lists):
+                members = sample[labels == list_id]
+                if len(members):
+                    centroids[list_id] = members.sum(axis=0)
+            centroids = _normalize(centroids)
+
+        assignments = self._assign(vectors[:count], centroids)
+        with self._lock:
+            self._set_centroids(centroids, assignments)
+            self._trained_at = len(live_rows)
+            if self.directory is not None:
+                np.save(self._file('.centroids.npy'), centroids)
+        logger.info(f"Trained index '{self.name}' into {n_lists} lists over {len(live_rows)} vectors")
+
+    def _train_in_background(self):
+        try:
+            self.train()
+        except Exception as e:
+            logger.error(f"Training index '{self.name}' failed: {e}")
+        finally:
+            with self._lock:
+                self._trainer = None
+
+    def wait_for_training(self, timeout: Optional[float] = None):
+        """Block until a background training run (if any) has finished"""
+        trainer = self._trainer
+        if trainer is not None:
+            trainer.join(timeout)
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest list per row, in blocks to bound the temporary score matrix"""
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), 65536):
+            block = vectors[start:start + 65536]
+            assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assignments
+
+    def _set_centroids(self, centroids: np.ndarray, assignments: Optional[np.ndarray] = None):
+        """Swap in new lists; rows past the precomputed `assignments` are assigned here"""
+        centroids = centroids.astype(np.float32)
+        assigned = 0
+        if assignments is not None:
+            assigned = len(assignments)
+            self._assignments[:assigned] = assignments
+        self._assignments[assigned:self._count] = self._assign(self._vectors[assigned:self._count], centroids)
+        self._centroids = centroids
+        self._trained_at = max(self._trained_at, len(self._rows))
+
+    # ------------------------------------------------------------------ search
+
+    def search(self, query: np.ndarray, k: int,
+               allowed: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k (id, cosine similarity) pairs, best first
+
+        `allowed` restricts results to a set of IDs. Sets up to
+        EXACT_FILTER_LIMIT are scored exactly; larger ones filter the rows
+        probed through the IVF lists.
+        """
+        query = _normalize(query)
+        with self._lock:
+            if not self._rows or k <= 0:
+                return []
+
+            if allowed is not None and (self._centroids is None or len(allowed) <= self.EXACT_FILTER_LIMIT):
+                rows = np.fromiter(
+                    (self._rows[item_id] for item_id in allowed if item_id in self._rows), dtype=np.int64
+                )
+            elif self._centroids is not None:
+                n_probe = min(self.n_probe, len(self._centroids))
+                probe = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+                rows = np.flatnonzero(np.isin(self._assignments[:self._count], probe))
+            else:
+                rows = np.arange(self._count)
+
+            if len(rows) == 0:
+                return []
+
+            scores = self._vectors[rows] @ query
+            scores[~self._live[rows]] = -np.inf
+            if allowed is not None and len(allowed) > self.EXACT_FILTER_LIMIT and self._centroids is not None:
+                # Large filters are applied to the probed rows only
+                outside = np.fromiter((self._ids[row] not in allowed for row in rows), dtype=bool, count=len(rows))
+                scores[outside] = -np.inf
+
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [(self._ids[rows[i]], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+class AttributeIndex:
+    """
+    Inverted index from canonical skill to IDs, plus years of experience per ID
+
+    Persisted as an append-only JSON-lines log (`<name>.attributes.log`).
+    """
+
+    def __init__(self, directory: Optional[str] = None, name: str = "attributes"):
+        self.directory = Path(directory) if directory else None
+        self.name = name
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = {}  # Skill -> IDs
+        self._skills: Dict[str, Tuple[str, ...]] = {}
+        self._years: Dict[str, int] = {}
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    @property
+    def _log_path(self) -> Path:
+        return self.directory / f"{self.name}.attributes.log"
+
+    def _load(self):
+        if not self._log_path.exists():
+            return
+        with open(self._log_path, 'r') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # Torn final write
+                entry = json.loads(line)
+                if entry.get('removed'):
+                    self._remove(entry['id'])
+                else:
+                    self._add(entry['id'], entry['skills'], entry['years'])
+
+    def _append_log(self, entries: List[Dict]):
+        if self.directory is None:
+            return
+        with open(self._log_path, 'a') as f:
+            f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+
+    def __len__(self) -> int:
+        return len(self._years)
+
+    def _add(self, item_id: str, skills: Iterable[str], years: int):
+        self._remove(item_id)
+        skills = tuple(sorted(set(skills)))
+        for skill in skills:
+            self._postings.setdefault(skill, set()).add(item_id)
+        self._skills[item_id] = skills
+        self._years[item_id] = years
+
+    def _remove(self, item_id: str):
+        for skill in self._skills.pop(item_id, ()):
+            postings = self._postings.get(skill)
+            if postings is not None:
+                postings.discard(item_id)
+                if not postings:
+                    del self._postings[skill]
+        self._years.pop(item_id, None)
+
+    def add(self, item_id: str, skills: Iterable[str], years: int):
+        """Index (or re-index) an ID's skills and years of experience"""
+        skills = sorted(set(skills))
+        with self._lock:
+            self._append_log([{'id': item_id, 'skills': skills, 'years': years}])
+            self._add(item_id, skills, years)
+
+    def remove(self, ids: Iterable[str]):
+        """Drop IDs from the index"""
+        with self._lock:
+            removed = [item_id for item_id in ids if item_id in self._years]
+            self._append_log([{'id': item_id, 'removed': True} for item_id in removed])
+            for item_id in removed:
+                self._remove(item_id)
+
+    def filter(self, required_skills: Iterable[str] = (), min_years: int = 0) -> Set[str]:
+        """IDs having every required skill and at least min_years of experience"""
+        with self._lock:
+            required = set(required_skills)
+            if required:
+                # Intersect smallest posting lists first
+                postings = sorted((self._postings.get(skill, set()) for skill in required), key=len)
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates &= posting
+                    if not candidates:
+                        break
+            else:
+                candidates = self._years.keys()
+
+            if min_years > 0:
+                return {item_id for item_id in candidates if self._years[item_id] >= min_years}
+            return set(candidates)
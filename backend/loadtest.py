@@ -0,0 +1,389 @@
+"""
+Load generator for the scoring API.
+
+Drives `/score`, `/score/batch` or `/score/stream` with synthetic resumes
+and jobs (synthetic.py, drawing skills from SkillTaxonomy) and reports the
+latency distribution, error rate and achieved throughput:
+
+- fixed rate (`--rate`): open loop; requests start on schedule whether or
+  not earlier ones have finished, as independent users would send them
+- fixed concurrency (`--concurrency`): closed loop; N clients each send
+  their next request as soon as the previous one returns
+
+Passing several values (`--rate 5,10,20,40`) runs one step per value and
+reports the saturation point: the first step where the server falls
+behind the offered rate, errors exceed `--max-error-rate`, p95 exceeds
+`--slo-ms`, or (at fixed concurrency) more clients stop adding throughput.
+
+Runs against the app in-process by default, so no server or network is
+needed; `--url` targets a running server instead:
+
+    python loadtest.py --rate 5,10,20,40 --duration 20 --output load.json
+    python loadtest.py --concurrency 1,2,4,8 --url http://localhost:8000
+    python loadtest.py --rate 5,10,20,40 --duration 20 --compare load.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+import synthetic
+from benchmark import git_commit
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS = {'score': '/score', 'batch': '/score/batch', 'stream': '/score/stream'}
+
+# Achieved/offered rate below which a fixed-rate step counts as saturated
+SATURATION_RATIO = 0.9
+
+# Throughput gain from a concurrency step below which more clients no longer help
+MIN_CONCURRENCY_GAIN = 0.1
+
+# Throughput drop against the baseline that --compare reports as a regression
+REGRESSION_RATIO = 0.8
+
+IN_PROCESS_URL = 'http://loadtest'
+
+# Requests generated at a time when resumes don't repeat
+GENERATE_CHUNK = 50
+
+
+@dataclass
+class StepResult:
+    """Outcome of every request sent during one step"""
+    mode: str
+    target: float
+    latencies_s: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    pairs: int = 0
+    elapsed_s: float = 0.0
+
+    def record(self, status: str, latency_s: float, pairs: int):
+        self.statuses[status] += 1
+        if status == '200':
+            self.latencies_s.append(latency_s)
+            self.pairs += pairs
+
+    def summary(self) -> Dict[str, Any]:
+        sent = sum(self.statuses.values())
+        ok = self.statuses['200']
+        latencies = np.asarray(self.latencies_s) * 1000
+        percentiles = {
+            f'p{q}_ms': round(float(np.percentile(latencies, q)), 1) if ok else None
+            for q in (50, 90, 95, 99)
+        }
+        return {
+            'mode': self.mode,
+            'target': self.target,
+            'sent': sent,
+            'ok': ok,
+            'error_rate': round(1 - ok / sent, 4) if sent else 0.0,
+            'statuses': dict(sorted(self.statuses.items())),
+            **percentiles,
+            'max_ms': round(float(latencies.max()), 1) if ok else None,
+            'requests_per_s': round(ok / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            'pairs_per_s': round(self.pairs / self.elapsed_s, 2) if self.elapsed_s else 0.0
+        }
+
+
+def build_requests(endpoint: str, pairs: Sequence[Tuple[str, str, str]],
+                   batch_size: int = 8) -> List[Tuple[str, Dict[str, Any], int]]:
+    """(path, request kwargs, pairs scored) per request: one pair each for /score, batch_size otherwise"""
+    path = ENDPOINTS[endpoint]
+    if endpoint == 'score':
+        return [(path, {'json': {'resume_text': resume, 'job_description': job, 'company_name': company}}, 1)
+                for resume, job, company in pairs]
+
+    requests = []
+    for start in range(0, len(pairs), batch_size):
+        group = pairs[start:start + batch_size]
+        if endpoint == 'batch':
+            # One job per batch request, as a recruiter ranking applicants would send it
+            _, job, company = group[0]
+            body = {'json': {'resumes': [resume for resume, _, _ in group],
+                             'job_description': job, 'company_name': company}}
+        else:
+            body = {'content': ''.join(
+                json.dumps({'resume_text': resume, 'job_description': job, 'company_name': company}) + '\n'
+                for resume, job, company in group
+            ), 'headers': {'Content-Type': 'application/x-ndjson'}}
+        requests.append((path, body, len(group)))
+    return requests
+
+
+def request_stream(endpoint: str, batch_size: int = 8, corpus: int = 0, words: int = 300,
+                   job_words: int = 150, jobs: int = 20, seed: int = 0) -> Iterator[Tuple[str, Dict[str, Any], int]]:
+    """
+    Endless requests built from SkillTaxonomy vocabulary
+
+    Resumes never repeat unless `corpus` is set, in which case that many
+    distinct requests are cycled (and repeats hit the server's caches).
+    Jobs always come from a fixed pool of `jobs`, as in real traffic.
+    """
+    vocabulary = synthetic.taxonomy_vocabulary()
+    per_request = 1 if endpoint == 'score' else batch_size
+    if corpus:
+        pairs = synthetic.generate_pairs(corpus * per_request, words, job_words, jobs, seed, vocabulary)
+        yield from itertools.cycle(build_requests(endpoint, pairs, batch_size))
+        return
+
+    job_pool = synthetic.generate_jobs(jobs, job_words, seed, vocabulary)
+    rng = random.Random(seed)
+    companies = [rng.choice(synthetic.COMPANIES) for _ in job_pool]
+    for chunk in itertools.count():
+        # Fresh resumes in chunks, each chunk from its own seed
+        resumes = synthetic.generate_resumes(GENERATE_CHUNK * per_request, words, seed + 1000 + chunk, vocabulary)
+        picks = [rng.randrange(len(job_pool)) for _ in range(GENERATE_CHUNK)]
+        pairs = [(resume, job_pool[picks[index // per_request]], companies[picks[index // per_request]])
+                 for index, resume in enumerate(resumes)]
+        yield from build_requests(endpoint, pairs, batch_size)
+
+
+async def _send(client: httpx.AsyncClient, request: Tuple[str, Dict[str, Any], int], step: StepResult):
+    path, kwargs, pairs = request
+    start = time.perf_counter()
+    try:
+        response = await client.post(path, **kwargs)
+        status = str(response.status_code)
+    except httpx.TimeoutException:
+        status = 'timeout'
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    step.record(status, time.perf_counter() - start, pairs)
+
+
+async def run_rate(client: httpx.AsyncClient, requests: Iterator, rate: float, duration: float) -> StepResult:
+    """Start `rate` requests per second for `duration` seconds, then wait for all of them"""
+    step = StepResult('rate', rate)
+    tasks = []
+    start = time.perf_counter()
+    for index in itertools.count():
+        due = start + index / rate
+        if due - start >= duration:
+            break
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_send(client, next(requests), step)))
+    await asyncio.gather(*tasks)
+    step.elapsed_s = time.perf_counter() - start
+    return step
+
+
+async def run_concurrency(client: httpx.AsyncClient, requests: Iterator, concurrency: int,
+                          duration: float) -> StepResult:
+    """Keep `concurrency` requests in flight for `duration` seconds"""
+    step = StepResult('concurrency', concurrency)
+    start = time.perf_counter()
+    deadline = start + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await _send(client, next(requests), step)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    step.elapsed_s = time.perf_counter() - start
+    return step
+
+
+def saturation(steps: Sequence[Dict[str, Any]], max_error_rate: float = 0.01,
+               slo_ms: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """The first saturated step and why, or None if every step kept up"""
+    for index, step in enumerate(steps):
+        reasons = []
+        if step['error_rate'] > max_error_rate:
+            reasons.append(f"error rate {step['error_rate']:.1%}")
+        if slo_ms and (step['p95_ms'] is None or step['p95_ms'] > slo_ms):
+            reasons.append(f"p95 {step['p95_ms']}ms over {slo_ms}ms")
+        if step['mode'] == 'rate' and step['requests_per_s'] < SATURATION_RATIO * step['target']:
+            reasons.append(f"served {step['requests_per_s']}/s of {step['target']}/s offered")
+        if step['mode'] == 'concurrency' and index > 0:
+            previous = steps[index - 1]['requests_per_s']
+            if previous and step['requests_per_s'] < previous * (1 + MIN_CONCURRENCY_GAIN):
+                reasons.append(f"throughput {step['requests_per_s']}/s vs {previous}/s with fewer clients")
+        if reasons:
+            sustained = steps[index - 1] if index > 0 else None
+            return {
+                'target': step['target'],
+                'reasons': reasons,
+                'max_sustained_requests_per_s': sustained['requests_per_s'] if sustained else None
+            }
+    return None
+
+
+async def _status(client: httpx.AsyncClient, path: str) -> Optional[int]:
+    try:
+        return (await client.get(path)).status_code
+    except httpx.HTTPError:
+        return None
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float):
+    """
+    Wait for /ready; after `timeout`, carry on if the server is at least up
+
+    /ready never turns 200 without an embedding model, yet such a server
+    still scores (with the TF-IDF fallback), so that is what gets measured.
+    """
+    deadline = time.perf_counter() + timeout
+    while await _status(client, '/ready') != 200:
+        if time.perf_counter() > deadline:
+            if await _status(client, '/health') != 200:
+                raise RuntimeError(f"Server not up after {timeout:.0f}s")
+            logger.warning(f"Server not ready after {timeout:.0f}s (no embedding model?); "
+                           f"load testing the TF-IDF fallback")
+            return
+        await asyncio.sleep(0.5)
+
+
+async def run(mode: str, targets: Sequence[float], endpoint: str = 'score', duration: float = 10.0,
+              url: Optional[str] = None, batch_size: int = 8, corpus: int = 0, words: int = 300,
+              job_words: int = 150, jobs: int = 20, seed: int = 0, warmup: float = 2.0,
+              request_timeout: float = 60.0, max_error_rate: float = 0.01,
+              slo_ms: Optional[float] = None, ready_timeout: float = 300.0) -> Dict[str, Any]:
+    """
+    Run one step per target against `url` (or the app in-process) and return the report
+
+    Waits up to `ready_timeout` seconds for /ready first (0 skips the wait).
+    """
+    requests = request_stream(endpoint, batch_size, corpus, words, job_words, jobs, seed)
+
+    app = None
+    if url:
+        transport = None
+    else:
+        # Startup hooks (executor, warm-up) don't run under ASGITransport on their own
+        from main import app
+        await app.router.startup()
+        transport = httpx.ASGITransport(app=app)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=url or IN_PROCESS_URL, transport=transport,
+                                     timeout=request_timeout, limits=limits) as client:
+            if ready_timeout > 0:
+                await _wait_ready(client, ready_timeout)
+            if warmup > 0:
+                await run_concurrency(client, requests, 1, warmup)
+
+            steps = []
+            for target in targets:
+                if mode == 'rate':
+                    step = await run_rate(client, requests, target, duration)
+                else:
+                    step = await run_concurrency(client, requests, int(target), duration)
+                summary = step.summary()
+                steps.append(summary)
+                logger.info(f"{mode} {target}: {summary['requests_per_s']} req/s, p50 {summary['p50_ms']}ms, "
+                            f"p95 {summary['p95_ms']}ms, errors {summary['error_rate']:.1%}")
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'target': url or 'in-process'
+        },
+        'config': {
+            'mode': mode, 'endpoint': endpoint, 'duration_s': duration, 'batch_size': batch_size,
+            'corpus': corpus, 'words': words, 'job_words': job_words, 'jobs': jobs, 'seed': seed
+        },
+        'steps': steps,
+        'saturation': saturation(steps, max_error_rate, slo_ms)
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = REGRESSION_RATIO) -> List[str]:
+    """Print current/baseline throughput and p95 ratios per step; returns the regressed steps"""
+    if report['config'] != baseline.get('config'):
+        print("warning: load configuration differs from the baseline", file=sys.stderr)
+
+    before = {step['target']: step for step in baseline.get('steps', [])}
+    regressions = []
+    print(f"{'target':>8}{'req/s ratio':>13}{'p95 ratio':>11}")
+    for step in report['steps']:
+        old = before.get(step['target'])
+        if not old or not old['requests_per_s']:
+            continue
+        throughput = step['requests_per_s'] / old['requests_per_s']
+        latency = step['p95_ms'] / old['p95_ms'] if step['p95_ms'] and old['p95_ms'] else float('nan')
+        print(f"{step['target']:>8g}{throughput:>13.2f}{latency:>11.2f}")
+        if throughput < threshold:
+            regressions.append(f"{step['mode']} {step['target']:g}")
+    return regressions
+
+
+def _targets(value: str) -> List[float]:
+    return [float(item) for item in value.split(',') if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fixed-rate / fixed-concurrency load test of the scoring API")
+    load = parser.add_mutually_exclusive_group(required=True)
+    load.add_argument('--rate', type=_targets, help="Requests per second; comma-separated for several steps")
+    load.add_argument('--concurrency', type=_targets, help="Requests in flight; comma-separated for several steps")
+    parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='score')
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per step")
+    parser.add_argument('--url', help="Running server to target (default: the app in-process)")
+    parser.add_argument('--batch-size', type=int, default=8, help="Pairs per batch/stream request")
+    parser.add_argument('--corpus', type=int, default=0,
+                        help="Cycle through this many distinct requests (default: never repeat a resume)")
+    parser.add_argument('--words', type=int, default=300, help="Approximate resume length")
+    parser.add_argument('--job-words', type=int, default=150, help="Approximate job description length")
+    parser.add_argument('--jobs', type=int, default=20, help="Distinct job descriptions")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warmup', type=float, default=2.0, help="Seconds of single-client traffic first")
+    parser.add_argument('--request-timeout', type=float, default=60.0)
+    parser.add_argument('--ready-timeout', type=float, default=300.0,
+                        help="Seconds to wait for /ready before loading anyway if /health is up (0: don't wait)")
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help="Error rate that counts as saturated")
+    parser.add_argument('--slo-ms', type=float, help="p95 latency that counts as saturated")
+    parser.add_argument('--output', help="Write the JSON report here (default: stdout)")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO,
+                        help="Throughput ratio below which --compare exits non-zero")
+    args = parser.parse_args(argv)
+
+    mode = 'rate' if args.rate else 'concurrency'
+    report = asyncio.run(run(
+        mode, args.rate or args.concurrency, args.endpoint, args.duration, args.url, args.batch_size,
+        args.corpus, args.words, args.job_words, args.jobs, args.seed, args.warmup,
+        args.request_timeout, args.max_error_rate, args.slo_ms, args.ready_timeout
+    ))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(report, indent=2))
+
+    if report['saturation']:
+        print(f"Saturated at {mode} {report['saturation']['target']:g}: "
+              f"{'; '.join(report['saturation']['reasons'])}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressed (throughput < {args.threshold}x baseline): {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger('httpx').setLevel(logging.WARNING)  # One line per request otherwise
+    sys.exit(main())
@@ -1,11 +1,106 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import logging
+import os
+import threading
+import time
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, validator
-from typing import List, Dict, Union, Any
-from scoring import calculate_advanced_score  # ← Fixed import
+from typing import List, Dict, Union, Any, Optional
+from scoring import (  # ← Fixed import
+    ProfileNotFound,
+    calculate_advanced_score,
+    calculate_batch_scores,
+    calculate_stored_profile_score,
+    get_scorer,
+    prepare_worker_process,
+    recommend_jobs,
+    recommend_jobs_for_stored_resume,
+    register_job,
+    register_resume,
+    search_candidates,
+    search_candidates_for_stored_job,
+    unregister_job,
+    unregister_resume,
+    warm_up
+)
+import metrics
+from pipeline import DEFAULT_BATCH_SIZE, abatches, aiter_lines, batch_error, score_batch, to_json
+from serving import BackfillQueue, DegradationPolicy, ExecutorSaturated, InferenceExecutor
+
+# Upper bound on resumes accepted by a single /score/batch call
+MAX_BATCH_RESUMES = 10000
+
+# Upper bound on pairs per batch of a /score/stream call
+MAX_STREAM_BATCH_SIZE = 1000
+
+# How long a /score/stream batch waits before retrying a full inference queue
+STREAM_RETRY_S = 0.5
+
+# Default and maximum time a scoring request may wait for inference
+SCORING_TIMEOUT_S = float(os.environ.get("SCORING_TIMEOUT_S", 30))
+MAX_SCORING_TIMEOUT_S = float(os.environ.get("MAX_SCORING_TIMEOUT_S", 300))
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Resume Job Scoring Engine", version="2.0.0")
 
+# Set once the model is loaded and has encoded a canned pair
+model_ready = threading.Event()
+
+def _warm_up():
+    try:
+        if warm_up():
+            model_ready.set()
+            logger.info("Model warmed up; ready for traffic")
+        else:
+            logger.error("No embedding model loaded; /ready will keep reporting 503")
+    except Exception as e:
+        logger.error(f"Warm-up failed: {e}")
+
+# Model inference runs here rather than in the default threadpool, so
+# concurrency and queue depth are bounded independently of other endpoints.
+# In process mode the model is loaded once and shared by the forked workers.
+inference_executor = InferenceExecutor.from_env(
+    preload=_warm_up, initializer=prepare_worker_process
+)
+
+# Registration and retrieval read and update the profile store and indexes
+# this process holds, so in process mode they run on a bounded thread pool
+# here rather than in a forked worker; otherwise they share the one executor
+index_executor = (
+    InferenceExecutor(
+        max_workers=int(os.environ.get("SCORING_WORKERS", min(4, os.cpu_count() or 1))),
+        max_queue=inference_executor.max_queue
+    ) if inference_executor.processes else inference_executor
+)
+
+# Under overload scoring skips transformer inference; degraded results are
+# recomputed precisely in the background once the load has passed
+degradation = DegradationPolicy.from_env()
+
+def _backfill_busy() -> bool:
+    # An idle executor always has room, even if the degraded flag hasn't been
+    # re-evaluated since the spike; otherwise wait for recovery and a free worker
+    depth = inference_executor.depth
+    return depth > 0 and (degradation.degraded or depth >= inference_executor.max_workers)
+
+backfill = BackfillQueue(inference_executor.submit, busy=_backfill_busy)
+
+# Live serving state, read at scrape time alongside the recorded stage metrics
+metrics.Gauge('scoring_executor_in_flight', 'Scoring calls queued or running',
+              lambda: inference_executor.depth)
+metrics.Gauge('scoring_executor_calls', 'Scoring calls by outcome since start',
+              lambda: {key: value for key, value in inference_executor.stats().items()
+                       if key in ('completed', 'rejected', 'timeouts')}, label='outcome')
+metrics.Gauge('scoring_degraded', '1 while scoring is degraded to TF-IDF',
+              lambda: int(degradation.degraded))
+metrics.Gauge('scoring_backfill_pending', 'Degraded results waiting to be recomputed',
+              lambda: backfill.stats()['pending'])
+metrics.Gauge('scoring_result_cache_entries', 'Entries in the result cache',
+              lambda: get_scorer().cache.stats()['entries'])
+
 # Add CORS middleware for frontend connection
 app.add_middleware(
     CORSMiddleware,
@@ -21,12 +116,89 @@ class JobResumeRequest(BaseModel):
     resume_text: str
     job_description: str
     company_name: str = "unknown"
+    job_id: Optional[str] = None  # Reuse the parsed job across requests
+    timeout_seconds: Optional[float] = None  # Defaults to SCORING_TIMEOUT_S
     
     @validator('resume_text', 'job_description')
     def text_must_not_be_empty(cls, v):
         if not v.strip():
             raise ValueError('Text fields cannot be empty')
         return v.strip()
+    
+    @validator('timeout_seconds')
+    def timeout_must_be_in_range(cls, v):
+        if v is not None and not 0 < v <= MAX_SCORING_TIMEOUT_S:
+            raise ValueError(f'Must be between 0 and {MAX_SCORING_TIMEOUT_S} seconds')
+        return v
+
+class BatchScoringRequest(BaseModel):
+    resumes: List[str]
+    job_description: str
+    company_name: str = "unknown"
+    job_id: Optional[str] = None
+    timeout_seconds: Optional[float] = None
+    
+    @validator('resumes')
+    def resumes_must_not_be_empty(cls, v):
+        if not v:
+            raise ValueError('At least one resume is required')
+        if len(v) > MAX_BATCH_RESUMES:
+            raise ValueError(f'At most {MAX_BATCH_RESUMES} resumes per batch')
+        return [text.strip() for text in v]
+    
+    @validator('job_description')
+    def job_must_not_be_empty(cls, v):
+        if not v.strip():
+            raise ValueError('Text fields cannot be empty')
+        return v.strip()
+    
+    @validator('timeout_seconds')
+    def timeout_must_be_in_range(cls, v):
+        if v is not None and not 0 < v <= MAX_SCORING_TIMEOUT_S:
+            raise ValueError(f'Must be between 0 and {MAX_SCORING_TIMEOUT_S} seconds')
+        return v
+
+class ResumeProfileRequest(BaseModel):
+    resume_text: str
+    resume_id: Optional[str] = None
+    
+    @validator('resume_text')
+    def text_must_not_be_empty(cls, v):
+        if not v.strip():
+            raise ValueError('Text fields cannot be empty')
+        return v.strip()
+
+class JobProfileRequest(BaseModel):
+    job_description: str
+    job_id: Optional[str] = None
+    company_name: str = "unknown"
+    
+    @validator('job_description')
+    def text_must_not_be_empty(cls, v):
+        if not v.strip():
+            raise ValueError('Text fields cannot be empty')
+        return v.strip()
+
+class ProfileScoringRequest(BaseModel):
+    resume_id: str
+    job_id: str
+    company_name: Optional[str] = None  # Defaults to the job's company
+
+class JobRecommendationRequest(BaseModel):
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None  # Stored profile, instead of resume_text
+    top_k: int = 20
+    shortlist_size: int = 200
+    
+    @validator('top_k', 'shortlist_size')
+    def must_be_in_range(cls, v):
+        if not 1 <= v <= 1000:
+            raise ValueError('Must be between 1 and 1000')
+        return v
+
+class RequirementMatch(BaseModel):
+    requirement: str  # Line from the job description
+    similarity: float  # Best cosine against any chunk of the resume
 
 # Enhanced response model - fixed the 'any' type issue
 class AdvancedScoringResponse(BaseModel):
@@ -37,10 +209,113 @@ class AdvancedScoringResponse(BaseModel):
     company_modifier: int
     final_score: int
     explanation: str
+    method_used: str = "semantic"  # How semantic similarity was computed
+    degraded: bool = False  # Scored on the cheap path under load; not cached
+    requirement_matches: List[RequirementMatch] = []
     
     class Config:
         arbitrary_types_allowed = True
 
+class RankedScoringResponse(AdvancedScoringResponse):
+    index: int  # Position of the resume in the request
+    rank: int   # 1 = best match
+
+class BatchScoringResponse(BaseModel):
+    total: int
+    results: List[RankedScoringResponse]
+
+class ProfileResponse(BaseModel):
+    id: str
+    years: int
+    level: str
+    skills: Dict[str, List[str]]
+
+def _profile_summary(profile_id: str, profile) -> ProfileResponse:
+    return ProfileResponse(
+        id=profile_id,
+        years=profile.experience.years,
+        level=profile.experience.level.value,
+        skills={category: [m.skill for m in matches] for category, matches in profile.skills.items()}
+    )
+
+class JobRecommendation(AdvancedScoringResponse):
+    job_id: str
+    rank: int
+    retrieval_similarity: float
+
+class JobRecommendationResponse(BaseModel):
+    results: List[JobRecommendation]
+
+class CandidateSearchRequest(BaseModel):
+    job_description: Optional[str] = None
+    job_id: Optional[str] = None  # Stored profile, instead of job_description
+    company_name: Optional[str] = None
+    top_k: int = 50
+    shortlist_size: int = 500
+    required_skills: List[str] = []
+    min_years: Optional[int] = None  # Defaults to 80% of the job's stated years
+    
+    @validator('top_k', 'shortlist_size')
+    def must_be_in_range(cls, v):
+        if not 1 <= v <= 5000:
+            raise ValueError('Must be between 1 and 5000')
+        return v
+
+class CandidateMatch(AdvancedScoringResponse):
+    resume_id: str
+    rank: int
+    retrieval_similarity: float
+
+class CandidateSearchResponse(BaseModel):
+    results: List[CandidateMatch]
+
+async def _run_inference(fn, *args, timeout: Optional[float] = None,
+                         executor: Optional[InferenceExecutor] = None):
+    """Run a scoring call on the inference executor, mapping overload to 503/504"""
+    start = time.perf_counter()
+    try:
+        result = await (executor or inference_executor).run(fn, *args, timeout=timeout or SCORING_TIMEOUT_S)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        degradation.observe(time.perf_counter() - start)
+        raise HTTPException(status_code=504, detail="Scoring timed out")
+    elapsed = time.perf_counter() - start
+    degradation.observe(elapsed)
+    metrics.STAGE_SECONDS.observe(elapsed, 'request')
+    return result
+
+async def _run_scoring(fn, *args, timeout: Optional[float] = None):
+    """
+    Run a scoring entry point, degraded when the node is overloaded
+
+    fn takes a trailing `degraded` flag and returns one formatted result or a
+    list of them; if any came back degraded the precise call is queued for backfill.
+    """
+    degraded = degradation.should_degrade(inference_executor.depth)
+    result = await _run_inference(fn, *args, degraded, timeout=timeout)
+    results = result if isinstance(result, list) else [result]
+    if any(item.get('degraded') for item in results):
+        backfill.add(fn, *args)
+    return result
+
+@app.on_event("startup")
+def start_executor():
+    if inference_executor.processes:
+        # Workers fork from a parent that already holds the warmed model
+        inference_executor.start()
+        index_executor.start()
+    else:
+        # Serve /health immediately; /ready flips when this finishes
+        inference_executor.start()
+        threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    inference_executor.shutdown()
+    if index_executor is not inference_executor:
+        index_executor.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "Advanced Resume Job Scoring Engine API v2.0"}
@@ -49,8 +324,39 @@ def root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+def readiness_check():
+    if not model_ready.is_set():
+        raise HTTPException(status_code=503, detail="Model loading")
+    return {"status": "ready"}
+
+@app.get("/cache/stats")
+def cache_stats():
+    scorer = get_scorer()
+    return {
+        "results": scorer.cache.stats(),
+        "embeddings": {"entries": len(scorer.semantic_matcher.embedding_store)}
+    }
+
+@app.get("/executor/stats")
+def executor_stats():
+    batcher = get_scorer().semantic_matcher.encode_batcher
+    return {
+        **inference_executor.stats(),
+        "encode_batching": batcher.stats() if batcher else None,
+        "degradation": degradation.stats(),
+        "backfill": backfill.stats(),
+        "index": index_executor.stats() if index_executor is not inference_executor else None
+    }
+
+@app.get("/metrics")
+def metrics_endpoint():
+    if not metrics.enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled (set METRICS_ENABLED=1)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/score", response_model=AdvancedScoringResponse)
-def score_resume_job_match(request: JobResumeRequest):
+async def score_resume_job_match(request: JobResumeRequest):
     try:
         if len(request.resume_text) < 50:
             raise HTTPException(status_code=400, detail="Resume text too short (minimum 50 characters)")
@@ -58,13 +364,191 @@ def score_resume_job_match(request: JobResumeRequest):
         if len(request.job_description) < 30:
             raise HTTPException(status_code=400, detail="Job description too short (minimum 30 characters)")
         
-        result = calculate_advanced_score(
+        result = await _run_scoring(
+            calculate_advanced_score,
             request.resume_text, 
             request.job_description, 
-            request.company_name
+            request.company_name,
+            request.job_id,
+            timeout=request.timeout_seconds
         )
         
         return AdvancedScoringResponse(**result)
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/score/batch", response_model=BatchScoringResponse)
+async def score_resume_batch(request: BatchScoringRequest):
+    try:
+        for index, resume_text in enumerate(request.resumes):
+            if len(resume_text) < 50:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Resume {index} text too short (minimum 50 characters)"
+                )
+        
+        if len(request.job_description) < 30:
+            raise HTTPException(status_code=400, detail="Job description too short (minimum 30 characters)")
+        
+        results = await _run_scoring(
+            calculate_batch_scores,
+            request.resumes,
+            request.job_description,
+            request.company_name,
+            request.job_id,
+            timeout=request.timeout_seconds
+        )
+        
+        return BatchScoringResponse(total=len(results), results=results)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body generator may still be reading the request
+    
+    Starlette's version watches for client disconnect by consuming receive(),
+    which would swallow request body chunks; here request.stream() sees the
+    disconnect (as ClientDisconnect) instead.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def _score_stream_batch(batch):
+    """Score one /score/stream batch, waiting out a full queue rather than failing the stream"""
+    while True:
+        try:
+            return await inference_executor.run(score_batch, batch, timeout=SCORING_TIMEOUT_S)
+        except ExecutorSaturated:
+            await asyncio.sleep(STREAM_RETRY_S)
+        except asyncio.TimeoutError:
+            return batch_error(batch, "Scoring timed out")
+        except Exception as e:
+            return batch_error(batch, f"Scoring failed: {str(e)}")
+
+@app.post("/score/stream")
+async def score_stream(request: Request,
+                       batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_STREAM_BATCH_SIZE)):
+    # The body is read batch by batch as results are sent, so neither side is
+    # ever held whole; a slow consumer slows reading through TCP backpressure
+    async def results():
+        async for batch in abatches(aiter_lines(request.stream()), batch_size):
+            records = await _score_stream_batch(batch)
+            yield ''.join(to_json(record) for record in records)
+    
+    return _DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.post("/profiles/resume", response_model=ProfileResponse)
+async def create_resume_profile(request: ResumeProfileRequest):
+    if len(request.resume_text) < 50:
+        raise HTTPException(status_code=400, detail="Resume text too short (minimum 50 characters)")
+    try:
+        profile = await _run_inference(register_resume, request.resume_text, request.resume_id,
+                                       executor=index_executor)
+        return _profile_summary(profile.resume_id, profile)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/profiles/job", response_model=ProfileResponse)
+async def create_job_profile(request: JobProfileRequest):
+    if len(request.job_description) < 30:
+        raise HTTPException(status_code=400, detail="Job description too short (minimum 30 characters)")
+    try:
+        profile = await _run_inference(register_job, request.job_description, request.job_id,
+                                       request.company_name, executor=index_executor)
+        return _profile_summary(profile.job_id, profile)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/score/profiles", response_model=AdvancedScoringResponse)
+async def score_stored_profiles(request: ProfileScoringRequest):
+    # Profiles are loaded on the executor: store reads and a first call
+    # during warm-up would otherwise block the event loop
+    try:
+        result = await _run_scoring(
+            calculate_stored_profile_score, request.resume_id, request.job_id, request.company_name
+        )
+        return AdvancedScoringResponse(**result)
+    except HTTPException:
+        raise
+    except ProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.delete("/profiles/job/{job_id}")
+def delete_job_profile(job_id: str):
+    if not unregister_job(job_id):
+        raise HTTPException(status_code=404, detail=f"Unknown job_id: {job_id}")
+    return {"deleted": job_id}
+
+@app.post("/recommend/jobs", response_model=JobRecommendationResponse)
+async def recommend_jobs_for_resume(request: JobRecommendationRequest):
+    if request.resume_id:
+        recommend, resume = recommend_jobs_for_stored_resume, request.resume_id
+    elif request.resume_text and len(request.resume_text.strip()) >= 50:
+        recommend, resume = recommend_jobs, request.resume_text.strip()
+    else:
+        raise HTTPException(status_code=400, detail="Provide resume_id or resume_text (minimum 50 characters)")
+    
+    try:
+        results = await _run_inference(recommend, resume, request.top_k, request.shortlist_size,
+                                       executor=index_executor)
+        return JobRecommendationResponse(results=results)
+    except HTTPException:
+        raise
+    except ProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.delete("/profiles/resume/{resume_id}")
+def delete_resume_profile(resume_id: str):
+    if not unregister_resume(resume_id):
+        raise HTTPException(status_code=404, detail=f"Unknown resume_id: {resume_id}")
+    return {"deleted": resume_id}
+
+@app.post("/search/candidates", response_model=CandidateSearchResponse)
+async def search_candidates_for_job(request: CandidateSearchRequest):
+    if request.job_id:
+        search, job = search_candidates_for_stored_job, request.job_id
+    elif request.job_description and len(request.job_description.strip()) >= 30:
+        search, job = search_candidates, request.job_description.strip()
+    else:
+        raise HTTPException(status_code=400, detail="Provide job_id or job_description (minimum 30 characters)")
+    
+    try:
+        results = await _run_inference(
+            search,
+            job,
+            request.company_name,
+            request.top_k,
+            request.required_skills,
+            request.min_years,
+            request.shortlist_size,
+            executor=index_executor
+        )
+        return CandidateSearchResponse(results=results)
+    except HTTPException:
+        raise
+    except ProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
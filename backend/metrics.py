@@ -0,0 +1,206 @@
+"""
+Prometheus-style metrics for the scoring hot path.
+
+- Counter and Histogram: labelled, thread-safe, kept in a process-wide registry
+- Gauge: a callback read at scrape time (e.g. executor queue depth)
+- render(): the registry in the Prometheus text exposition format, served
+  by main.py at /metrics
+- timed(stage): decorator recording a call's duration in scoring_stage_seconds
+
+Recording is off unless METRICS_ENABLED=1 (or enable() is called). While
+off, every recording call returns after a single flag check, so the
+instrumentation can stay on the hot path.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+_enabled = os.environ.get('METRICS_ENABLED', '0') == '1'
+
+# Latency buckets in seconds, from regex-sized to model-sized calls
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Items per batch
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True):
+    """Turn recording on or off for this process"""
+    global _enabled
+    _enabled = on
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+        REGISTRY.append(self)
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        if not _enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Bucketed distribution (count and sum included) per label combination"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per label combination: [count per bucket (last = +Inf)], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        REGISTRY.append(self)
+
+    def observe(self, value: float, *labels: str):
+        if not _enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._values.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = 'le="{}"'.format('+Inf' if bound == float('inf') else _number(bound))
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total[0])}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge:
+    """Value read from a callback at scrape time; a dict result gives one series per label value"""
+
+    def __init__(self, name: str, documentation: str,
+                 read: Callable[[], Union[float, Dict[str, float]]], label: Optional[str] = None):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        self.label = label
+        REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        value = self.read()
+        if isinstance(value, dict):
+            for label_value, item in sorted(value.items()):
+                lines.append(f"{self.name}{_labels((self.label,), (label_value,))} {_number(item)}")
+        else:
+            lines.append(f"{self.name} {_number(value)}")
+        return lines
+
+    def clear(self):
+        pass
+
+
+REGISTRY: List[Union[Counter, Histogram, Gauge]] = []
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def clear():
+    """Reset every recorded value (gauges are read live and unaffected)"""
+    for metric in REGISTRY:
+        metric.clear()
+
+
+STAGE_SECONDS = Histogram(
+    'scoring_stage_seconds', 'Time spent in each scoring stage (stages nest: score includes skills, ...)',
+    labels=('stage',)
+)
+SIMILARITY_METHOD = Counter(
+    'scoring_similarity_method_total', 'Scored results by semantic similarity method', labels=('method',)
+)
+CACHE_REQUESTS = Counter(
+    'scoring_cache_requests_total', 'Result and embedding cache lookups', labels=('cache', 'result')
+)
+BATCH_SIZE = Histogram(
+    'scoring_batch_size', 'Items per batched call', labels=('kind',), buckets=SIZE_BUCKETS
+)
+
+
+def timed(stage: str):
+    """Decorator recording each call's wall time under scoring_stage_seconds{stage=...}"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - start, stage)
+        return wrapper
+    return decorator
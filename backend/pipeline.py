@@ -0,0 +1,216 @@
+"""
+Streaming NDJSON scoring pipeline for bulk (resume, job) pairs.
+
+Input is one JSON object per line:
+
+    {"id": "r1-j7", "resume_text": "...", "job_description": "...",
+     "company_name": "acme", "job_id": "j7"}
+
+(`id`, `company_name` and `job_id` are optional). Lines are read lazily,
+grouped into batches of up to `batch_size` lines, scored with
+`calculate_pair_scores` (pairs sharing a job within a batch are encoded
+together), and results are written as soon as their batch is done, one line
+per input line and in input order:
+
+    {"line": 1, "id": "r1-j7", "final_score": 72, ...}
+    {"line": 2, "error": "resume_text too short (minimum 50 characters)"}
+
+At most one batch is held in memory at a time, so memory use does not grow
+with the input. The same pipeline backs `POST /score/stream`.
+
+    python pipeline.py pairs.ndjson -o scores.ndjson --batch-size 64
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Pairs scored per call; large enough to fill encoder batches
+DEFAULT_BATCH_SIZE = 64
+
+# Longest accepted input line, so one bad record can't exhaust memory
+MAX_LINE_BYTES = 4 * 1024 * 1024
+
+# Same minimums as the single-pair API
+MIN_RESUME_CHARS = 50
+MIN_JOB_CHARS = 30
+
+
+@dataclass
+class ScoringPair:
+    """One valid input line"""
+    line: int
+    resume_text: str
+    job_description: str
+    company_name: str = "unknown"
+    job_id: Optional[str] = None
+    id: Optional[Any] = None
+
+
+def parse_line(line_number: int, raw: Union[str, bytes]) -> Union[ScoringPair, Dict[str, Any], None]:
+    """A ScoringPair, an error record for an invalid line, or None for a blank one"""
+    if not raw.strip():
+        return None
+    if len(raw) > MAX_LINE_BYTES:
+        return {'line': line_number, 'error': f"Line longer than {MAX_LINE_BYTES} bytes"}
+    try:
+        record = json.loads(raw)
+    except ValueError as e:
+        return {'line': line_number, 'error': f"Invalid JSON: {e}"}
+    if not isinstance(record, dict):
+        return {'line': line_number, 'error': "Expected a JSON object"}
+
+    record_id = record.get('id')
+    resume_text = str(record.get('resume_text') or '').strip()
+    job_description = str(record.get('job_description') or '').strip()
+    if len(resume_text) < MIN_RESUME_CHARS:
+        error = f"resume_text too short (minimum {MIN_RESUME_CHARS} characters)"
+    elif len(job_description) < MIN_JOB_CHARS:
+        error = f"job_description too short (minimum {MIN_JOB_CHARS} characters)"
+    else:
+        return ScoringPair(
+            line=line_number,
+            resume_text=resume_text,
+            job_description=job_description,
+            company_name=record.get('company_name') or "unknown",
+            job_id=record.get('job_id'),
+            id=record_id
+        )
+    return {'line': line_number, 'id': record_id, 'error': error}
+
+
+def batches(lines: Iterable[Union[str, bytes]],
+            batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Union[ScoringPair, Dict[str, Any]]]]:
+    """Parsed lines (pairs and error records) in input order, at most batch_size per batch"""
+    batch = []
+    for line_number, raw in enumerate(lines, start=1):
+        item = parse_line(line_number, raw)
+        if item is None:
+            continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def abatches(lines: AsyncIterable[Union[str, bytes]],
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[List[Union[ScoringPair, Dict[str, Any]]]]:
+    """Async counterpart of batches()"""
+    batch, line_number = [], 0
+    async for raw in lines:
+        line_number += 1
+        item = parse_line(line_number, raw)
+        if item is None:
+            continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def aiter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream (e.g. a request body) into lines without buffering it whole"""
+    buffer, skipping = b'', False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            if skipping:
+                skipping = False  # Tail of an oversized line
+            else:
+                yield line
+        if skipping:
+            buffer = b''
+        elif len(buffer) > MAX_LINE_BYTES:
+            # Pass the oversized line on to be rejected, and drop the rest of it
+            yield buffer
+            buffer, skipping = b'', True
+    if buffer:
+        yield buffer
+
+
+def score_batch(batch: List[Union[ScoringPair, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Score the pairs of one batch; output records in input order"""
+    from scoring import calculate_pair_scores
+
+    pairs = [item for item in batch if isinstance(item, ScoringPair)]
+    scores = calculate_pair_scores([
+        (pair.resume_text, pair.job_description, pair.company_name, pair.job_id) for pair in pairs
+    ]) if pairs else []
+    scored = {pair.line: score for pair, score in zip(pairs, scores)}
+    return [
+        {'line': item.line, 'id': item.id, **scored[item.line]} if isinstance(item, ScoringPair) else item
+        for item in batch
+    ]
+
+
+def batch_error(batch: List[Union[ScoringPair, Dict[str, Any]]], error: str) -> List[Dict[str, Any]]:
+    """Error records for every pair in a batch that could not be scored"""
+    return [
+        {'line': item.line, 'id': item.id, 'error': error} if isinstance(item, ScoringPair) else item
+        for item in batch
+    ]
+
+
+def to_json(record: Dict[str, Any]) -> str:
+    """One NDJSON output line; enums (experience levels) are written as their values, as by the HTTP API"""
+    return json.dumps(record, default=lambda value: value.value if isinstance(value, Enum) else str(value)) + '\n'
+
+
+def run(lines: Iterable[Union[str, bytes]], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """Score an NDJSON line stream, yielding output records as each batch finishes"""
+    for batch in batches(lines, batch_size):
+        try:
+            yield from score_batch(batch)
+        except Exception as e:
+            logger.error(f"Batch scoring failed: {e}")
+            yield from batch_error(batch, f"Scoring failed: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score (resume, job) pairs from NDJSON, streaming results")
+    parser.add_argument('input', help="NDJSON file of pairs, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="NDJSON results file, or - for stdout")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start, scored, errors = time.perf_counter(), 0, 0
+    try:
+        for record in run(source, args.batch_size):
+            sink.write(to_json(record))
+            if 'error' in record:
+                errors += 1
+            else:
+                scored += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'scored': scored,
+        'errors': errors,
+        'seconds': round(elapsed, 2),
+        'pairs_per_second': round(scored / elapsed, 1) if elapsed else None
+    }), file=sys.stderr)
+    return 0 if errors == 0 else 1
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
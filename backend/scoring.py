@@ -3,28 +3,38 @@ Industry-standard resume-job scoring engine implementing best practices from
 CareerBuilder, LinkedIn, and other major recruitment platforms.
 
 Based on:
-- Hybrid NLP pipelines (spaCy + transformers)
+- Hybrid NLP pipelines (regex extraction + transformers)
 - Domain-specific sentence transformers
 - Skill taxonomy with standardized ontologies
 - Multi-dimensional scoring with confidence weighting
 """
 
-import spacy
 import re
+import sys
 import numpy as np
-from typing import Dict, List, Tuple, Set, Optional
-from dataclasses import dataclass
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Tuple, Set, Optional, Union
+from dataclasses import asdict, dataclass, replace
 from enum import Enum
+from types import MappingProxyType
 import logging
+import os
+import threading
 from pathlib import Path
 
-# ML/NLP imports
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+# ML/NLP stacks (torch, sentence-transformers, scikit-learn) are imported
+# where they are first used, so importing this module stays fast
 import hashlib
 import json
 
+from caching import EmbeddingStore, ProfileStore, ResultCache
+from chunking import CHUNK_MAX_WORDS, needs_chunking, pool, requirement_lines, split_into_chunks
+from encoders import EncoderBackend, TorchEncoder, create_encoder
+from indexing import AttributeIndex, VectorIndex
+from metrics import BATCH_SIZE, CACHE_REQUESTS, SIMILARITY_METHOD, timed
+from serving import MicroBatcher
+from tfidf import TfidfModel, load_or_fit
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,7 +49,16 @@ class ExperienceLevel(Enum):
     PRINCIPAL = "principal"
     EXECUTIVE = "executive"
 
-@dataclass
+# Seniority ordinal of each level, lowest first
+LEVEL_ORDER: Mapping[ExperienceLevel, int] = MappingProxyType(
+    {level: position for position, level in enumerate(ExperienceLevel)}
+)
+
+# Slotted where supported (3.10+), so the many matches and results held by
+# caches carry no per-instance __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class SkillMatch:
     """Standardized skill matching result"""
     skill: str
@@ -47,7 +66,120 @@ class SkillMatch:
     source: str  # 'exact', 'normalized', 'semantic'
     context: Optional[Dict] = None
 
-@dataclass
+class PackedSkills(Mapping):
+    """
+    Skill matches per category, packed into flat arrays
+    
+    Reads like the Dict[str, List[SkillMatch]] it replaces (lists are built
+    on access), but holds only an interned skill name, matched variant,
+    confidence and source code per hit plus one flat offsets array.
+    count() and names() serve the scoring paths without building matches.
+    """
+    
+    SOURCES = ('exact', 'normalized', 'semantic')
+    
+    __slots__ = ('_categories', '_bounds', '_skills', '_matched_as', '_confidences',
+                 '_sources', '_offsets', '_offset_bounds')
+    
+    def __init__(self, categories: Tuple[str, ...], bounds: array, skills: Tuple[str, ...],
+                 matched_as: Tuple[Optional[str], ...], confidences: array, sources: bytes,
+                 offsets: array, offset_bounds: array):
+        self._categories = categories
+        self._bounds = bounds                # Hits of category i: [bounds[i], bounds[i + 1])
+        self._skills = skills
+        self._matched_as = matched_as        # None where the match had no context
+        self._confidences = confidences
+        self._sources = sources              # Index into SOURCES
+        self._offsets = offsets
+        self._offset_bounds = offset_bounds  # Offsets of hit j: [offset_bounds[j], offset_bounds[j + 1])
+    
+    @classmethod
+    def from_hits(cls, hits_by_category: Mapping[str, List['SkillHit']],
+                  confidence: Callable[[int], float]) -> 'PackedSkills':
+        """Pack extractor hits, scoring each by its occurrence count"""
+        skills, matched_as, confidences, sources, offsets = [], [], array('d'), bytearray(), array('I')
+        bounds, offset_bounds = array('I', [0]), array('I', [0])
+        for hits in hits_by_category.values():
+            for hit in hits:
+                skills.append(hit.skill)
+                matched_as.append(hit.matched_as)
+                confidences.append(confidence(len(hit.offsets)))
+                sources.append(0 if hit.matched_as == hit.skill else 1)
+                offsets.extend(hit.offsets)
+                offset_bounds.append(len(offsets))
+            bounds.append(len(skills))
+        return cls(tuple(hits_by_category), bounds, tuple(skills), tuple(matched_as),
+                   confidences, bytes(sources), offsets, offset_bounds)
+    
+    @classmethod
+    def of(cls, skills: Mapping[str, Iterable[SkillMatch]]) -> 'PackedSkills':
+        """Pack a mapping of SkillMatch lists (returned as is if already packed)"""
+        if isinstance(skills, PackedSkills):
+            return skills
+        names, matched_as, confidences, sources, offsets = [], [], array('d'), bytearray(), array('I')
+        bounds, offset_bounds = array('I', [0]), array('I', [0])
+        for matches in skills.values():
+            for match in matches:
+                context = match.context or {}
+                variant = context.get('matched_as')
+                names.append(sys.intern(match.skill))
+                matched_as.append(sys.intern(variant) if variant is not None else None)
+                confidences.append(match.confidence)
+                sources.append(cls.SOURCES.index(match.source))
+                offsets.extend(context.get('offsets', ()))
+                offset_bounds.append(len(offsets))
+            bounds.append(len(names))
+        return cls(tuple(sys.intern(category) for category in skills), bounds, tuple(names),
+                   tuple(matched_as), confidences, bytes(sources), offsets, offset_bounds)
+    
+    def _span(self, category: str) -> Tuple[int, int]:
+        try:
+            index = self._categories.index(category)
+        except ValueError:
+            return 0, 0
+        return self._bounds[index], self._bounds[index + 1]
+    
+    def count(self, category: str) -> int:
+        """Number of skills matched in a category"""
+        start, end = self._span(category)
+        return end - start
+    
+    def names(self, category: str) -> Tuple[str, ...]:
+        """Canonical names of the skills matched in a category"""
+        start, end = self._span(category)
+        return self._skills[start:end]
+    
+    def _match(self, j: int) -> SkillMatch:
+        variant = self._matched_as[j]
+        context = None if variant is None else {
+            'matched_as': variant,
+            'offsets': self._offsets[self._offset_bounds[j]:self._offset_bounds[j + 1]].tolist()
+        }
+        return SkillMatch(skill=self._skills[j], confidence=self._confidences[j],
+                          source=self.SOURCES[self._sources[j]], context=context)
+    
+    def __getitem__(self, category: str) -> List[SkillMatch]:
+        if category not in self._categories:
+            raise KeyError(category)
+        start, end = self._span(category)
+        return [self._match(j) for j in range(start, end)]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._categories)
+    
+    def __len__(self) -> int:
+        return len(self._categories)
+    
+    def __repr__(self) -> str:
+        return f"PackedSkills({ {category: list(self.names(category)) for category in self._categories} })"
+    
+    def __sizeof__(self) -> int:
+        # Strings are interned and shared, so only their references count
+        return object.__sizeof__(self) + sum(
+            sys.getsizeof(getattr(self, slot)) for slot in self.__slots__
+        )
+
+@dataclass(frozen=True, **_SLOTS)
 class ExperienceProfile:
     """Structured experience data"""
     years: int
@@ -57,6 +189,106 @@ class ExperienceProfile:
     technical_depth: float
 
 @dataclass
+class DocumentFeatures:
+    """Per-document text quality signals used for semantic confidence"""
+    quality: float      # Fraction of professional terms present
+    word_count: int
+
+@dataclass
+class JobProfile:
+    """Job-side features parsed once and reused for every applicant"""
+    text: str
+    skills: Mapping[str, List[SkillMatch]]
+    experience: ExperienceProfile
+    features: DocumentFeatures
+    embedding: Optional[np.ndarray] = None
+    job_id: Optional[str] = None
+    company_name: str = "unknown"  # Posting's company, used when scoring by ID
+    requirement_lines: Tuple[str, ...] = ()
+    requirement_vectors: Optional[np.ndarray] = None  # Unit rows, one per requirement line
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable form for storage"""
+        return _profile_to_dict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'JobProfile':
+        vectors = data.get('requirement_vectors')
+        return cls(**_profile_fields_from_dict(data), job_id=data.get('job_id'),
+                   company_name=data.get('company_name', 'unknown'),
+                   requirement_lines=tuple(data.get('requirement_lines', ())),
+                   requirement_vectors=np.asarray(vectors, dtype=np.float32) if vectors is not None else None)
+
+@dataclass
+class ResumeProfile:
+    """Resume-side features extracted once at upload and reused for every job"""
+    text: str
+    skills: Mapping[str, List[SkillMatch]]
+    experience: ExperienceProfile
+    features: DocumentFeatures
+    embedding: Optional[np.ndarray] = None
+    resume_id: Optional[str] = None
+    chunk_vectors: Optional[np.ndarray] = None  # Unit rows of the pieces requirement lines match against
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable form for storage"""
+        return _profile_to_dict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ResumeProfile':
+        vectors = data.get('chunk_vectors')
+        return cls(**_profile_fields_from_dict(data), resume_id=data.get('resume_id'),
+                   chunk_vectors=np.asarray(vectors, dtype=np.float32) if vectors is not None else None)
+
+def _profile_to_dict(profile: Union[JobProfile, ResumeProfile]) -> Dict:
+    """Serialize a job or resume profile to plain JSON types"""
+    data = {
+        'text': profile.text,
+        'skills': {
+            category: [
+                {'skill': m.skill, 'confidence': m.confidence, 'source': m.source, 'context': m.context}
+                for m in matches
+            ]
+            for category, matches in profile.skills.items()
+        },
+        'experience': {
+            'years': profile.experience.years,
+            'level': profile.experience.level.value,
+            'confidence': profile.experience.confidence,
+            'leadership_indicators': profile.experience.leadership_indicators,
+            'technical_depth': profile.experience.technical_depth
+        },
+        'features': {'quality': profile.features.quality, 'word_count': profile.features.word_count},
+        'embedding': profile.embedding.tolist() if profile.embedding is not None else None
+    }
+    if isinstance(profile, JobProfile):
+        data['job_id'] = profile.job_id
+        data['company_name'] = profile.company_name
+        data['requirement_lines'] = list(profile.requirement_lines)
+        data['requirement_vectors'] = (profile.requirement_vectors.tolist()
+                                       if profile.requirement_vectors is not None else None)
+    else:
+        data['resume_id'] = profile.resume_id
+        data['chunk_vectors'] = profile.chunk_vectors.tolist() if profile.chunk_vectors is not None else None
+    return data
+
+def _profile_fields_from_dict(data: Dict) -> Dict:
+    """Rebuild the shared profile fields from their serialized form"""
+    experience = dict(data['experience'])
+    experience['level'] = ExperienceLevel(experience['level'])
+    embedding = data.get('embedding')
+    return {
+        'text': data['text'],
+        'skills': PackedSkills.of({
+            category: [SkillMatch(**match) for match in matches]
+            for category, matches in data['skills'].items()
+        }),
+        'experience': ExperienceProfile(**experience),
+        'features': DocumentFeatures(**data['features']),
+        'embedding': np.asarray(embedding, dtype=np.float32) if embedding is not None else None
+    }
+
+@dataclass(frozen=True, **_SLOTS)
 class ScoringResult:
     """Complete scoring result with breakdown"""
     overall_score: float
@@ -139,28 +371,279 @@ class SkillTaxonomy:
         }
     }
 
+    # Frozen O(1) lookup indexes derived from CATEGORIES by build_indexes()
+    ALIAS_INDEX: Mapping[str, str] = MappingProxyType({})        # alias/canonical -> canonical
+    CATEGORY_INDEX: Mapping[str, str] = MappingProxyType({})     # canonical -> category
+    WEIGHT_INDEX: Mapping[str, float] = MappingProxyType({})     # category -> weight
+    VARIANT_INDEX: Mapping[str, Tuple[str, ...]] = MappingProxyType({})  # canonical -> (canonical, *aliases)
+    version = 0  # Bumped on every rebuild so compiled consumers can refresh
+    
+    @classmethod
+    def build_indexes(cls):
+        """Rebuild lookup indexes; call after changing CATEGORIES"""
+        alias_index, category_index, weight_index, variant_index = {}, {}, {}, {}
+        
+        for category, category_data in cls.CATEGORIES.items():
+            # Interned, so every match, profile and result shares one copy of each name
+            category = sys.intern(category)
+            weight_index[category] = category_data['weight']
+            for canonical, aliases in category_data['skills'].items():
+                canonical, aliases = sys.intern(canonical), tuple(sys.intern(alias) for alias in aliases)
+                category_index.setdefault(canonical, category)
+                variant_index.setdefault(canonical, (canonical, *aliases))
+                # First definition wins, matching the original linear scan order
+                for variant in (canonical, *aliases):
+                    alias_index.setdefault(variant, canonical)
+        
+        cls.ALIAS_INDEX = MappingProxyType(alias_index)
+        cls.CATEGORY_INDEX = MappingProxyType(category_index)
+        cls.WEIGHT_INDEX = MappingProxyType(weight_index)
+        cls.VARIANT_INDEX = MappingProxyType(variant_index)
+        cls.version += 1
+    
     @classmethod
     def normalize_skill(cls, skill: str) -> str:
         """Normalize skill to canonical form using taxonomy"""
         skill_lower = skill.lower().strip()
+        return cls.ALIAS_INDEX.get(skill_lower, skill_lower)
+    
+    @classmethod
+    def normalize_many(cls, skills: Iterable[str]) -> List[str]:
+        """Normalize a batch of skill tokens to canonical form"""
+        lookup = cls.ALIAS_INDEX.get
+        normalized = []
+        for skill in skills:
+            skill_lower = skill.lower().strip()
+            normalized.append(lookup(skill_lower, skill_lower))
+        return normalized
+    
+    @classmethod
+    def get_skill_category(cls, skill: str) -> Optional[str]:
+        """Get category for a skill"""
+        return cls.CATEGORY_INDEX.get(cls.normalize_skill(skill))
+    
+    @classmethod
+    def get_category_weight(cls, category: str) -> float:
+        """Get the scoring weight of a category (0.0 if unknown)"""
+        return cls.WEIGHT_INDEX.get(category, 0.0)
+
+SkillTaxonomy.build_indexes()
+
+@dataclass
+class SkillHit:
+    """All occurrences of one canonical skill found in a text"""
+    skill: str
+    category: str
+    matched_as: str        # Variant that determined the match
+    offsets: List[int]     # Start offsets of every occurrence of matched_as
+
+class SkillExtractor:
+    """Single-pass skill extraction using the taxonomy compiled into one regex"""
+    
+    _pattern = None
+    _compiled_version = None
+    
+    @classmethod
+    def _compile(cls):
+        """Compile every taxonomy variant into one word-bounded alternation"""
+        # Longest first so "google-cloud-platform" wins over "google-cloud";
+        # boundaries only apply on alphanumeric edges so "c++" and ".net" still match
+        alternatives = []
+        for variant in sorted(SkillTaxonomy.ALIAS_INDEX, key=lambda v: (-len(v), v)):
+            alternative = re.escape(variant)
+            if variant[0].isalnum():
+                alternative = r'(?<![a-z0-9])' + alternative
+            if variant[-1].isalnum():
+                alternative += r'(?![a-z0-9])'
+            alternatives.append(alternative)
         
-        for category_data in cls.CATEGORIES.values():
-            for canonical, aliases in category_data['skills'].items():
-                if skill_lower == canonical or skill_lower in aliases:
-                    return canonical
+        cls._pattern = re.compile('|'.join(alternatives))
+        cls._compiled_version = SkillTaxonomy.version
+    
+    @classmethod
+    def find_skills(cls, text: str) -> Dict[str, List[SkillHit]]:
+        """Scan text once and return skill hits per category in taxonomy order"""
+        if cls._compiled_version != SkillTaxonomy.version:
+            cls._compile()
+        
+        occurrences: Dict[str, List[int]] = {}
+        for match in cls._pattern.finditer(text.lower()):
+            occurrences.setdefault(match.group(), []).append(match.start())
+        
+        hits_by_category = {category: [] for category in SkillTaxonomy.CATEGORIES}
+        if not occurrences:
+            return hits_by_category
         
-        return skill_lower
+        for canonical, variants in SkillTaxonomy.VARIANT_INDEX.items():
+            category = SkillTaxonomy.CATEGORY_INDEX[canonical]
+            # First variant present decides the match, as canonical outranks aliases
+            for variant in variants:
+                offsets = occurrences.get(variant)
+                if offsets:
+                    hits_by_category[category].append(
+                        SkillHit(skill=canonical, category=category,
+                                 matched_as=variant, offsets=offsets)
+                    )
+                    break
+        
+        return hits_by_category
 
+class SkillMatrix:
+    """
+    Skill sets as indicator rows over the canonical taxonomy vocabulary
+    
+    Every (category, canonical skill) pair gets a column, so N resumes become an
+    N x V boolean matrix and their skills-match scores against one job are a
+    few column reductions per category. Results are bit-for-bit equal to
+    ResumeJobScorer._calculate_skills_match (same float operations, same order).
+    """
+    
+    _columns: Mapping[Tuple[str, str], int] = MappingProxyType({})  # (category, skill) -> column
+    _column_categories = np.zeros(0, dtype=np.int64)  # Category position of each column
+    _categories: Tuple[Tuple[str, float], ...] = ()    # (category, weight) in scoring order
+    _compiled_version = None
+    
     @classmethod
-    def get_skill_category(cls, skill: str) -> Optional[str]:
-        """Get category for a skill"""
-        normalized = cls.normalize_skill(skill)
+    def _compile(cls):
+        """Lay out columns in taxonomy order"""
+        columns, column_categories = {}, []
+        cls._categories = tuple(SkillTaxonomy.WEIGHT_INDEX.items())
+        for position, (category, _) in enumerate(cls._categories):
+            for canonical in SkillTaxonomy.CATEGORIES[category]['skills']:
+                columns[(category, canonical)] = len(columns)
+                column_categories.append(position)
         
-        for category, category_data in cls.CATEGORIES.items():
-            if normalized in category_data['skills']:
-                return category
+        cls._columns = MappingProxyType(columns)
+        cls._column_categories = np.array(column_categories, dtype=np.int64)
+        cls._compiled_version = SkillTaxonomy.version
+    
+    @classmethod
+    def width(cls) -> int:
+        if cls._compiled_version != SkillTaxonomy.version:
+            cls._compile()
+        return len(cls._columns)
+    
+    @classmethod
+    def encode(cls, skills: Mapping[str, Iterable[SkillMatch]]) -> Optional[np.ndarray]:
+        """Indicator row for one skill set, or None if it holds a skill outside the vocabulary"""
+        row = np.zeros(cls.width(), dtype=bool)
+        skills = PackedSkills.of(skills)
+        for category in skills:
+            if category not in SkillTaxonomy.WEIGHT_INDEX:
+                continue  # Unweighted categories never affect the score
+            for skill in skills.names(category):
+                column = cls._columns.get((category, skill))
+                if column is None:
+                    return None
+                row[column] = True
+        return row
+    
+    @classmethod
+    def encode_many(cls, skill_sets: List[Mapping[str, Iterable[SkillMatch]]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(N x V indicator matrix, per-row mask of sets that could be encoded)"""
+        matrix = np.zeros((len(skill_sets), cls.width()), dtype=bool)
+        valid = np.ones(len(skill_sets), dtype=bool)
+        for i, skills in enumerate(skill_sets):
+            row = cls.encode(skills)
+            if row is None:
+                valid[i] = False
+            else:
+                matrix[i] = row
+        return matrix, valid
+    
+    @classmethod
+    def match_scores(cls, matrix: np.ndarray, job_row: np.ndarray) -> np.ndarray:
+        """Weighted skills-match score of every row of matrix against one job row"""
+        cls.width()
+        required = np.flatnonzero(job_row)
+        total = np.zeros(len(matrix), dtype=np.float64)
         
-        return None
+        for position, (_, weight) in enumerate(cls._categories):
+            category_required = required[cls._column_categories[required] == position]
+            if len(category_required):
+                # Intersection ratio
+                matched = matrix[:, category_required].sum(axis=1)
+                category_score = matched / len(category_required)
+            else:
+                # No requirements in this category
+                has_any = matrix[:, cls._column_categories == position].any(axis=1)
+                category_score = np.where(has_any, 1.0, 0.5)
+            total += category_score * weight
+        
+        return total
+    
+    @classmethod
+    def match_many(cls, skill_sets: List[Mapping[str, Iterable[SkillMatch]]],
+                   job_skills: Mapping[str, Iterable[SkillMatch]]) -> List[Optional[float]]:
+        """Skills-match score of each skill set against a job; None where a set can't be encoded"""
+        job_row = cls.encode(job_skills)
+        if job_row is None:
+            return [None] * len(skill_sets)
+        matrix, valid = cls.encode_many(skill_sets)
+        scores = cls.match_scores(matrix, job_row)
+        return [float(score) if ok else None for score, ok in zip(scores, valid)]
+
+@dataclass
+class ExperienceColumns:
+    """
+    Many ExperienceProfiles as parallel arrays, for batch experience scoring
+    
+    match_scores() applies the same piecewise rules as
+    ResumeJobScorer._calculate_experience_match to every row at once, with the
+    same float operations in the same order, so results are bit-for-bit equal.
+    """
+    years: np.ndarray
+    level: np.ndarray        # LEVEL_ORDER ordinal, -1 if unknown
+    leadership: np.ndarray
+    technical_depth: np.ndarray
+    
+    @classmethod
+    def from_profiles(cls, profiles: List[ExperienceProfile]) -> "ExperienceColumns":
+        return cls(
+            years=np.array([p.years for p in profiles]),
+            level=np.array([LEVEL_ORDER.get(p.level, -1) for p in profiles], dtype=np.int64),
+            leadership=np.array([p.leadership_indicators for p in profiles]),
+            technical_depth=np.array([p.technical_depth for p in profiles], dtype=np.float64)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.years)
+    
+    def level_scores(self, job_level: ExperienceLevel) -> np.ndarray:
+        """Seniority level match of every row against one job level"""
+        job_position = LEVEL_ORDER.get(job_level, -1)
+        if job_position < 0:
+            return np.full(len(self), 0.5)
+        gap = self.level - job_position
+        return np.select(
+            [self.level < 0, gap == 0, gap == 1, gap == -1, gap > 0],
+            [0.5, 1.0, 0.9, 0.8, 0.6],
+            default=0.4
+        )
+    
+    def match_scores(self, job_exp: ExperienceProfile) -> np.ndarray:
+        """Experience alignment score of every row against one job"""
+        # Years experience component
+        if job_exp.years > 0:
+            years_ratio = self.years / job_exp.years
+            years_score = np.where(
+                years_ratio >= 1.0, 1.0,
+                np.where(years_ratio >= 0.8, 0.9, years_ratio * 0.8)
+            )
+        else:
+            years_score = np.full(len(self), 1.0)
+        
+        # Seniority level component
+        level_score = self.level_scores(job_exp.level)
+        
+        # Leadership component
+        if job_exp.leadership_indicators > 0:
+            leadership_ratio = np.minimum(self.leadership / job_exp.leadership_indicators, 1.0)
+            leadership_score = 0.7 + (leadership_ratio * 0.3)
+        else:
+            leadership_score = np.full(len(self), 1.0)
+        
+        return years_score * 0.5 + level_score * 0.3 + leadership_score * 0.2
 
 class ExperienceAnalyzer:
     """Advanced experience level analysis using NLP"""
@@ -188,26 +671,52 @@ class ExperienceAnalyzer:
         (10, 15): ExperienceLevel.LEAD,
         (15, float('inf')): ExperienceLevel.PRINCIPAL
     }
+    
+    # Explicit level mentions that raise confidence
+    LEVEL_KEYWORDS = {
+        'senior': ('senior', 'sr.'),
+        'lead': ('lead', 'principal', 'staff'),
+        'junior': ('junior', 'jr.', 'entry'),
+        'mid': ('mid-level', 'intermediate')
+    }
+    
+    # Phrases indicating technical depth
+    DEPTH_INDICATORS = (
+        'architecture', 'design patterns', 'scalability',
+        'performance optimization', 'system design',
+        'microservices', 'distributed systems'
+    )
+    
+    # Precompiled PATTERNS. Every years pattern starts with r'(\d+)\+?\s*' followed
+    # by "year"/"yr", so a match can only begin at a digit run leading into one of
+    # these anchors; finding the anchors is a single fast literal-prefix scan
+    _YEARS = tuple(re.compile(pattern) for pattern in PATTERNS['years'])
+    _LEADERSHIP = tuple(re.compile(pattern) for pattern in PATTERNS['leadership'])
+    _YEAR_ANCHOR = re.compile(r'y(?:ear|r)')
+    _LEVEL_KEYWORDS_FLAT = tuple(kw for keywords in LEVEL_KEYWORDS.values() for kw in keywords)
 
     @classmethod
+    @timed('experience')
     def extract_experience(cls, text: str) -> ExperienceProfile:
         """Extract comprehensive experience profile"""
         text_lower = text.lower()
         
-        # Extract years of experience
+        # Extract years of experience (first pattern with any match wins)
         years = 0
-        for pattern in cls.PATTERNS['years']:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                years = max(int(m) for m in matches)
-                break
+        starts = cls._year_candidates(text_lower)
+        if starts:
+            for pattern in cls._YEARS:
+                matches = cls._findall_from(pattern, text_lower, starts)
+                if matches:
+                    years = max(int(m) for m in matches)
+                    break
         
         # Extract leadership indicators
         leadership_count = 0
         team_size = 0
         
-        for pattern in cls.PATTERNS['leadership']:
-            matches = re.findall(pattern, text_lower)
+        for pattern in cls._LEADERSHIP:
+            matches = pattern.findall(text_lower)
             if matches:
                 leadership_count += len(matches)
                 team_size = max(team_size, max(int(m) for m in matches))
@@ -229,6 +738,37 @@ class ExperienceAnalyzer:
             technical_depth=technical_depth
         )
     
+    @classmethod
+    def _year_candidates(cls, text: str) -> List[int]:
+        """Start of every digit run that leads, via '+' and whitespace, into a year anchor"""
+        starts = []
+        for anchor in cls._YEAR_ANCHOR.finditer(text):
+            i = anchor.start()
+            while i > 0 and text[i - 1].isspace():
+                i -= 1
+            if i > 0 and text[i - 1] == '+':
+                i -= 1
+            run_end = i
+            # str.isdecimal() is exactly the regex \d class
+            while i > 0 and text[i - 1].isdecimal():
+                i -= 1
+            if i < run_end and (not starts or starts[-1] != i):
+                starts.append(i)
+        return starts
+    
+    @staticmethod
+    def _findall_from(pattern: re.Pattern, text: str, starts: List[int]) -> List[str]:
+        """pattern.findall(text) when matches can only begin at the given sorted offsets"""
+        found, next_allowed = [], 0
+        for start in starts:
+            if start < next_allowed:
+                continue
+            match = pattern.match(text, start)
+            if match:
+                found.append(match.group(1))
+                next_allowed = match.end()
+        return found
+    
     @classmethod
     def _infer_seniority(cls, years: int, leadership: int, team_size: int) -> ExperienceLevel:
         """Infer seniority from multiple factors"""
@@ -258,93 +798,377 @@ class ExperienceAnalyzer:
             confidence += 0.3
         
         # Boost for explicit level mentions
-        level_keywords = {
-            'senior': ['senior', 'sr.'],
-            'lead': ['lead', 'principal', 'staff'],
-            'junior': ['junior', 'jr.', 'entry'],
-            'mid': ['mid-level', 'intermediate']
-        }
-        
-        for level_name, keywords in level_keywords.items():
-            if any(kw in text for kw in keywords):
-                confidence += 0.2
-                break
+        if any(kw in text for kw in cls._LEVEL_KEYWORDS_FLAT):
+            confidence += 0.2
         
         return min(confidence, 1.0)
     
     @classmethod
     def _assess_technical_depth(cls, text: str) -> float:
         """Assess technical depth from resume content"""
-        depth_indicators = [
-            'architecture', 'design patterns', 'scalability',
-            'performance optimization', 'system design',
-            'microservices', 'distributed systems'
-        ]
-        
-        matches = sum(1 for indicator in depth_indicators if indicator in text)
-        return min(matches / len(depth_indicators), 1.0)
+        matches = sum(1 for indicator in cls.DEPTH_INDICATORS if indicator in text)
+        return min(matches / len(cls.DEPTH_INDICATORS), 1.0)
 
 class SemanticMatcher:
     """Advanced semantic matching using domain-specific transformers"""
     
-    def __init__(self):
-        self.sentence_model = None
-        self.tfidf_vectorizer = None
+    MODEL_NAME = 'all-mpnet-base-v2'
+    
+    # Texts per forward pass when encoding many documents at once
+    ENCODE_BATCH_SIZE = 64
+    
+    # On-disk embedding store; set EMBEDDING_STORE_DIR="" to keep it in memory only
+    DEFAULT_STORE_DIR = str(Path(__file__).parent / '.embedding_store')
+    
+    def __init__(self, embedding_store: Optional[EmbeddingStore] = None,
+                 max_wait_ms: Optional[float] = None, max_batch: Optional[int] = None,
+                 encoder_backend: Optional[str] = None,
+                 chunk_words: Optional[int] = None, pooling: Optional[str] = None):
+        self.encoder: Optional[EncoderBackend] = None
+        self.encoder_backend = (encoder_backend or os.environ.get('ENCODER_BACKEND') or 'torch').lower()
+        self.tfidf: Optional[TfidfModel] = None
+        self._tfidf_lock = threading.Lock()
         self._load_models()
+        
+        # Documents longer than one encoder window are embedded chunk by chunk
+        self.chunk_words = chunk_words or int(os.environ.get('EMBED_CHUNK_WORDS', CHUNK_MAX_WORDS))
+        self.pooling = (pooling or os.environ.get('EMBED_POOLING', 'weighted')).lower()
+        
+        # Backends produce slightly different vectors, so each gets its own namespace
+        namespace = self.MODEL_NAME
+        if self.encoder is not None and self.encoder.name != 'torch':
+            namespace = f"{self.MODEL_NAME}.{self.encoder.name}"
+        self.embedding_store = embedding_store or EmbeddingStore(
+            os.environ.get('EMBEDDING_STORE_DIR', self.DEFAULT_STORE_DIR),
+            namespace=namespace
+        )
+        
+        # Micro-batching of concurrent encodes; a wait of 0 encodes each call directly
+        if max_wait_ms is None:
+            max_wait_ms = float(os.environ.get('ENCODE_MAX_WAIT_MS', 0))
+        if max_batch is None:
+            max_batch = int(os.environ.get('ENCODE_MAX_BATCH', self.ENCODE_BATCH_SIZE))
+        self.encode_batcher = MicroBatcher(
+            self._encode_texts, max_batch=max_batch, max_wait_ms=max_wait_ms, name="encode-batcher"
+        ) if max_wait_ms > 0 else None
     
     def _load_models(self):
         """Load and initialize models"""
         try:
             # Use domain-specific model for professional text
-            self.sentence_model = SentenceTransformer('all-mpnet-base-v2')
-            logger.info("✅ Loaded all-mpnet-base-v2 (professional-optimized)")
-            
-            # Initialize TF-IDF for fallback
-            self.tfidf_vectorizer = TfidfVectorizer(
-                stop_words='english',
-                ngram_range=(1, 3),  # Include trigrams for technical terms
-                max_features=10000,
-                lowercase=True,
-                min_df=1,
-                max_df=0.95
-            )
+            try:
+                self.encoder = create_encoder(self.encoder_backend, self.MODEL_NAME)
+            except Exception as e:
+                if self.encoder_backend == 'torch':
+                    raise
+                logger.warning(f"{self.encoder_backend} encoder unavailable ({e}); using torch")
+                self.encoder = TorchEncoder(self.MODEL_NAME)
+            logger.info(f"✅ Loaded all-mpnet-base-v2 (professional-optimized, {self.encoder.name})")
             
         except Exception as e:
             logger.error(f"Model loading failed: {e}")
-            self.sentence_model = None
+            self.encoder = None
     
-    def calculate_similarity(self, resume_text: str, job_text: str) -> Tuple[float, float, str]:
-        """Calculate semantic similarity with confidence and method tracking"""
+    @timed('semantic')
+    def calculate_similarity(self, resume_text: str, job_text: str, *,
+                             resume_embedding: Optional[np.ndarray] = None,
+                             job_embedding: Optional[np.ndarray] = None,
+                             resume_features: Optional[DocumentFeatures] = None,
+                             job_features: Optional[DocumentFeatures] = None,
+                             cached_only: bool = False) -> Tuple[float, float, str]:
+        """
+        Calculate semantic similarity with confidence and method tracking
         
-        if not self.sentence_model:
+        Precomputed embeddings and text features (from a JobProfile or
+        ResumeProfile) are used as-is; anything missing is computed here.
+        With cached_only nothing is encoded (see calculate_similarity_many).
+        """
+        
+        if not self.encoder:
             return self._fallback_similarity(resume_text, job_text)
         
+        if cached_only:
+            return self._similarity_many(
+                [resume_text], job_text,
+                resume_embeddings=[resume_embedding], resume_features=[resume_features],
+                job_embedding=job_embedding, job_features=job_features, cached_only=True
+            )[0]
+        
         try:
             # Preprocess texts for better domain understanding
-            resume_processed = self._preprocess_resume(resume_text)
-            job_processed = self._preprocess_job(job_text)
-            
-            # Calculate semantic similarity
-            embeddings = self.sentence_model.encode([resume_processed, job_processed])
-            similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+            missing = []
+            if resume_embedding is None:
+                missing.append(self._preprocess_resume(resume_text))
+            if job_embedding is None:
+                missing.append(self._preprocess_job(job_text))
             
-            # Calculate confidence
-            confidence = self._calculate_confidence(resume_text, job_text)
+            # Calculate semantic similarity, encoding whatever wasn't supplied in one call
+            if missing:
+                encoded = list(self.embed_documents(missing))
+                if resume_embedding is None:
+                    resume_embedding = encoded.pop(0)
+                if job_embedding is None:
+                    job_embedding = encoded.pop(0)
+            similarity = _cosine_to_vector(np.asarray([resume_embedding]), job_embedding)[0]
             
-            # Use hybrid approach if confidence is low
-            if confidence < 0.4:
-                tfidf_sim = self._tfidf_similarity(resume_text, job_text)
-                similarity = (similarity * confidence) + (tfidf_sim * (1 - confidence))
-                method = f"hybrid(sem:{confidence:.2f})"
-            else:
-                method = "semantic"
-            
-            return float(similarity), float(confidence), method
+            confidence = self._confidence_from_features(
+                resume_features or self.document_features(resume_text),
+                job_features or self.document_features(job_text)
+            )
+            return self._blend_similarity(similarity, confidence, resume_text, job_text)
             
         except Exception as e:
             logger.warning(f"Semantic similarity failed: {e}")
             return self._fallback_similarity(resume_text, job_text)
     
+    @timed('semantic')
+    def calculate_similarity_many(self, resume_texts: List[str], job_text: str, *,
+                                  resume_embeddings: Optional[List[Optional[np.ndarray]]] = None,
+                                  resume_features: Optional[List[Optional[DocumentFeatures]]] = None,
+                                  job_embedding: Optional[np.ndarray] = None,
+                                  job_features: Optional[DocumentFeatures] = None,
+                                  cached_only: bool = False) -> List[Tuple[float, float, str]]:
+        """
+        Score many resumes against one job: job encoded once, resumes batch-encoded
+        
+        Per-resume embeddings/features may be supplied (None entries are computed).
+        With cached_only (degraded mode) nothing is encoded: embeddings come
+        from the store, and pairs missing one are scored by TF-IDF alone
+        ("tfidf_degraded").
+        """
+        return self._similarity_many(
+            resume_texts, job_text, resume_embeddings=resume_embeddings, resume_features=resume_features,
+            job_embedding=job_embedding, job_features=job_features, cached_only=cached_only
+        )
+    
+    def _similarity_many(self, resume_texts: List[str], job_text: str, *,
+                         resume_embeddings: Optional[List[Optional[np.ndarray]]] = None,
+                         resume_features: Optional[List[Optional[DocumentFeatures]]] = None,
+                         job_embedding: Optional[np.ndarray] = None,
+                         job_features: Optional[DocumentFeatures] = None,
+                         cached_only: bool = False) -> List[Tuple[float, float, str]]:
+        """calculate_similarity_many without the stage timing, shared with calculate_similarity"""
+        
+        if not self.encoder:
+            return self._fallback_similarity_many(resume_texts, job_text)
+        
+        try:
+            embed = self.cached_documents if cached_only else self.embed_documents
+            if job_embedding is None:
+                job_embedding = embed([self._preprocess_job(job_text)])[0]
+            job_features = job_features or self.document_features(job_text)
+            
+            embeddings = list(resume_embeddings or [None] * len(resume_texts))
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            if missing:
+                encoded = embed([self._preprocess_resume(resume_texts[i]) for i in missing])
+                for i, embedding in zip(missing, encoded):
+                    embeddings[i] = embedding
+            features = resume_features or [None] * len(resume_texts)
+            confidences = [
+                self._confidence_from_features(resume_feature or self.document_features(resume_text), job_features)
+                for resume_text, resume_feature in zip(resume_texts, features)
+            ]
+            
+            # Only reachable with cached_only: no stored vector for one side
+            unembedded = [i for i, embedding in enumerate(embeddings)
+                          if embedding is None or job_embedding is None]
+            embedded = [i for i, embedding in enumerate(embeddings)
+                        if embedding is not None and job_embedding is not None]
+            
+            # One matrix-vector product instead of N pairwise cosine calls
+            similarities = dict(zip(embedded, _cosine_to_vector(
+                np.stack([embeddings[i] for i in embedded]), job_embedding
+            ))) if embedded else {}
+            
+            # Low-confidence and unembedded resumes get their TF-IDF similarity in one sparse product
+            lexical_indexes = unembedded + [i for i in embedded if confidences[i] < self.HYBRID_CONFIDENCE]
+            lexical = dict(zip(lexical_indexes, self._tfidf_similarity_many(
+                [resume_texts[i] for i in lexical_indexes], job_text
+            )))
+            
+            return [
+                (lexical[i], confidences[i], "tfidf_degraded") if i not in similarities
+                else self._blend_similarity(similarities[i], confidences[i], resume_texts[i], job_text, lexical.get(i))
+                for i in range(len(resume_texts))
+            ]
+            
+        except Exception as e:
+            logger.warning(f"Batch semantic similarity failed: {e}")
+            return self._fallback_similarity_many(resume_texts, job_text)
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, one float32 row per text, encoding only texts never seen before"""
+        keys = [EmbeddingStore.content_key(text) for text in texts]
+        found = self.embedding_store.get_many(keys)
+        
+        # Encode each unseen document once, even if it repeats within the batch
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        CACHE_REQUESTS.inc('embedding', 'hit', amount=len(keys) - len(missing))
+        CACHE_REQUESTS.inc('embedding', 'miss', amount=len(missing))
+        
+        if missing:
+            encoder = self.encode_batcher or self._encode_texts
+            vectors = encoder(list(missing.values()))
+            self.embedding_store.put_many(list(missing.keys()), vectors)
+            found.update(zip(missing.keys(), vectors))
+        
+        return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+    
+    def _pieces(self, text: str) -> Tuple[List[str], Optional[list]]:
+        """Texts to encode for a document: itself if it fits one window, else its chunks"""
+        if not needs_chunking(text, self.chunk_words):
+            return [text], None
+        chunks = split_into_chunks(text, self.chunk_words)
+        return [chunk.text for chunk in chunks], chunks
+    
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        One embedding per document, long documents chunked and pooled
+        
+        Short documents are encoded whole, exactly as by encode(). Longer ones
+        are split into section-aligned chunks that are encoded together with
+        everything else in one call and pooled (self.pooling: mean, max or
+        section-weighted). Chunks are cached by content, so an edited document
+        only re-encodes its changed chunks.
+        """
+        pieces, spans = self._split_documents(texts)
+        vectors = self.encode(pieces)
+        return np.stack([
+            vectors[start] if chunks is None else pool(vectors[start:end], chunks, self.pooling)
+            for start, end, chunks in spans
+        ])
+    
+    def _split_documents(self, texts: List[str]) -> Tuple[List[str], List[Tuple[int, int, Optional[list]]]]:
+        """All pieces to encode for texts, and each document's (start, end, chunks) span of them"""
+        pieces, spans = [], []
+        for text in texts:
+            texts_to_encode, chunks = self._pieces(text)
+            spans.append((len(pieces), len(pieces) + len(texts_to_encode), chunks))
+            pieces.extend(texts_to_encode)
+        return pieces, spans
+    
+    def cached_documents(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Like embed_documents but store lookups only: None for a document with any piece never encoded"""
+        pieces, spans = self._split_documents(texts)
+        keys = [EmbeddingStore.content_key(piece) for piece in pieces]
+        found = self.embedding_store.get_many(keys)
+        
+        documents = []
+        for start, end, chunks in spans:
+            if not all(key in found for key in keys[start:end]):
+                documents.append(None)
+            elif chunks is None:
+                documents.append(np.asarray(found[keys[start]], dtype=np.float32))
+            else:
+                vectors = np.stack([found[key] for key in keys[start:end]]).astype(np.float32, copy=False)
+                documents.append(pool(vectors, chunks, self.pooling))
+        return documents
+    
+    def requirement_vectors(self, job_text: str) -> Tuple[List[str], Optional[np.ndarray]]:
+        """A job's requirement lines and their unit vectors (None without a model or lines)"""
+        lines = requirement_lines(job_text)
+        if not self.encoder or not lines:
+            return lines, None
+        return lines, _unit_rows(self.encode(lines))
+    
+    def chunk_vectors(self, resume_text: str) -> Optional[np.ndarray]:
+        """Unit vectors of the pieces (whole text or chunks) a resume's requirements are matched on"""
+        if not self.encoder:
+            return None
+        pieces, _ = self._pieces(self._preprocess_resume(resume_text))
+        return _unit_rows(self.encode(pieces))
+    
+    def match_requirements(self, resume_texts: List[str], job_text: str, *,
+                           resume_chunk_vectors: Optional[List[Optional[np.ndarray]]] = None,
+                           requirements: Optional[Tuple[List[str], Optional[np.ndarray]]] = None
+                           ) -> List[List[Tuple[str, float]]]:
+        """
+        Chunk-level max-sim of each job requirement line against each resume
+        
+        Precomputed chunk vectors (ResumeProfile.chunk_vectors) and requirement
+        lines/vectors (JobProfile) are used where given; everything else is
+        encoded in one call. Returns, per resume, (requirement line, best
+        cosine over the resume's chunks).
+        """
+        lines, line_vectors = requirements if requirements else (requirement_lines(job_text), None)
+        if not self.encoder or not lines:
+            return [[] for _ in resume_texts]
+        
+        pieces = [] if line_vectors is not None else list(lines)
+        chunk_vectors = list(resume_chunk_vectors or [None] * len(resume_texts))
+        spans = {}
+        for i, text in enumerate(resume_texts):
+            if chunk_vectors[i] is None:
+                texts_to_encode, _ = self._pieces(self._preprocess_resume(text))
+                spans[i] = (len(pieces), len(pieces) + len(texts_to_encode))
+                pieces.extend(texts_to_encode)
+        
+        if pieces:
+            vectors = _unit_rows(self.encode(pieces))
+            if line_vectors is None:
+                line_vectors = vectors[:len(lines)]
+            for i, (start, end) in spans.items():
+                chunk_vectors[i] = vectors[start:end]
+        
+        return [
+            list(zip(lines, (line_vectors @ vectors.T).max(axis=1).tolist()))
+            for vectors in chunk_vectors
+        ]
+    
+    @timed('encode')
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Run the encoder backend over texts in batched calls"""
+        BATCH_SIZE.observe(len(texts), 'encode')
+        return self.encoder.encode(texts, batch_size=self.ENCODE_BATCH_SIZE)
+    
+    # Canned pair for warm-up, so the first real request doesn't pay for lazy init
+    WARMUP_TEXTS = (
+        "Software engineer with 5 years of experience in Python, Django and AWS.",
+        "Hiring a backend developer with Python and cloud experience."
+    )
+    
+    def warm_up(self) -> bool:
+        """Load the TF-IDF model and push the canned pair through the encoder; False without a model"""
+        self._tfidf_model()
+        if not self.encoder:
+            return False
+        self._encode_texts(list(self.WARMUP_TEXTS))
+        return True
+    
+    def embed_job(self, job_text: str) -> Optional[np.ndarray]:
+        """Embedding of a job description, or None when no model is loaded"""
+        if not self.encoder:
+            return None
+        return self.embed_documents([self._preprocess_job(job_text)])[0]
+    
+    def embed_resume(self, resume_text: str) -> Optional[np.ndarray]:
+        """Embedding of a resume, or None when no model is loaded"""
+        if not self.encoder:
+            return None
+        return self.embed_documents([self._preprocess_resume(resume_text)])[0]
+    
+    # Semantic confidence below which TF-IDF similarity is blended in
+    HYBRID_CONFIDENCE = 0.4
+    
+    def _blend_similarity(self, similarity: float, confidence: float, 
+                          resume_text: str, job_text: str,
+                          tfidf_sim: Optional[float] = None) -> Tuple[float, float, str]:
+        """Apply hybrid TF-IDF blending to a raw similarity when confidence is low"""
+        # Use hybrid approach if confidence is low
+        if confidence < self.HYBRID_CONFIDENCE:
+            if tfidf_sim is None:
+                tfidf_sim = self._tfidf_similarity(resume_text, job_text)
+            similarity = (similarity * confidence) + (tfidf_sim * (1 - confidence))
+            method = f"hybrid(sem:{confidence:.2f})"
+        else:
+            method = "semantic"
+        
+        return float(similarity), float(confidence), method
+    
     def _preprocess_resume(self, text: str) -> str:
         """Simplified preprocessing - keep more context"""
         # Just clean up the text, don't over-filter
@@ -355,47 +1179,95 @@ class SemanticMatcher:
         # Just clean up the text, don't over-filter
         return text.strip()
     
+    # Text quality indicators
+    PROFESSIONAL_TERMS = (
+        'experience', 'skills', 'developed', 'managed', 'led',
+        'implemented', 'designed', 'built', 'created', 'responsible'
+    )
+    
+    def document_features(self, text: str) -> DocumentFeatures:
+        """Per-document half of the confidence calculation"""
+        text_lower = text.lower()
+        quality = sum(1 for term in self.PROFESSIONAL_TERMS 
+                      if term in text_lower) / len(self.PROFESSIONAL_TERMS)
+        return DocumentFeatures(quality=quality, word_count=len(text.split()))
+    
     def _calculate_confidence(self, resume_text: str, job_text: str) -> float:
         """Improved confidence calculation"""
+        return self._confidence_from_features(
+            self.document_features(resume_text), self.document_features(job_text)
+        )
+    
+    def _confidence_from_features(self, resume: DocumentFeatures, job: DocumentFeatures) -> float:
+        """Combine per-document features into a pair confidence"""
         # Base confidence higher
         base_confidence = 0.4
         
-        # Text quality indicators
-        professional_terms = [
-            'experience', 'skills', 'developed', 'managed', 'led',
-            'implemented', 'designed', 'built', 'created', 'responsible'
-        ]
-        
-        resume_quality = sum(1 for term in professional_terms 
-                        if term in resume_text.lower()) / len(professional_terms)
-        job_quality = sum(1 for term in professional_terms 
-                        if term in job_text.lower()) / len(professional_terms)
-        
         # Length factors (more generous)
-        resume_length = min(len(resume_text.split()) / 100, 1.0)
-        job_length = min(len(job_text.split()) / 50, 1.0)
+        resume_length = min(resume.word_count / 100, 1.0)
+        job_length = min(job.word_count / 50, 1.0)
         
         # More generous confidence calculation
-        confidence = base_confidence + (resume_quality * 0.2 + job_quality * 0.2 + 
+        confidence = base_confidence + (resume.quality * 0.2 + job.quality * 0.2 + 
                                     resume_length * 0.1 + job_length * 0.1)
         
         return min(confidence, 1.0)
     
+    def _tfidf_model(self) -> TfidfModel:
+        """The corpus-fitted TF-IDF model, loaded (or seed-fitted) on first use"""
+        if self.tfidf is None:
+            with self._tfidf_lock:
+                if self.tfidf is None:
+                    # Every taxonomy skill is in the vocabulary even if the seed corpus lacks it
+                    self.tfidf = load_or_fit(seed_documents=[
+                        ' '.join(variants) for variants in SkillTaxonomy.VARIANT_INDEX.values()
+                    ])
+        return self.tfidf
+    
     def _tfidf_similarity(self, resume_text: str, job_text: str) -> float:
         """TF-IDF fallback similarity"""
+        return float(self._tfidf_similarity_many([resume_text], job_text)[0])
+    
+    @timed('tfidf')
+    def _tfidf_similarity_many(self, resume_texts: List[str], job_text: str) -> List[float]:
+        """TF-IDF similarity of many resumes to one job, transform-only against the fitted vocabulary"""
+        if not resume_texts:
+            return []
         try:
-            texts = [resume_text, job_text]
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(texts)
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return float(similarity)
-        except:
-            return 0.0
+            return self._tfidf_model().similarity_many(resume_texts, job_text).tolist()
+        except Exception as e:
+            logger.warning(f"TF-IDF similarity failed: {e}")
+            return [0.0] * len(resume_texts)
+    
+    # Low confidence for fallback
+    FALLBACK_CONFIDENCE = 0.3
     
     def _fallback_similarity(self, resume_text: str, job_text: str) -> Tuple[float, float, str]:
         """Fallback when semantic models fail"""
-        similarity = self._tfidf_similarity(resume_text, job_text)
-        confidence = 0.3  # Low confidence for fallback
-        return similarity, confidence, "tfidf_fallback"
+        return self._fallback_similarity_many([resume_text], job_text)[0]
+    
+    def _fallback_similarity_many(self, resume_texts: List[str], job_text: str) -> List[Tuple[float, float, str]]:
+        """Fallback for a batch, one sparse product for all resumes"""
+        return [
+            (similarity, self.FALLBACK_CONFIDENCE, "tfidf_fallback")
+            for similarity in self._tfidf_similarity_many(resume_texts, job_text)
+        ]
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise each row, leaving zero rows as zeros"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _cosine_to_vector(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row in matrix against a single vector"""
+    row_norms = np.linalg.norm(matrix, axis=1)
+    vector_norm = np.linalg.norm(vector)
+    # Zero vectors score 0, matching sklearn's cosine_similarity
+    row_norms[row_norms == 0] = 1.0
+    if vector_norm == 0:
+        vector_norm = 1.0
+    return (matrix @ vector) / (row_norms * vector_norm)
 
 class CompanyIntelligence:
     """Company-specific adjustments based on hiring patterns"""
@@ -437,122 +1309,287 @@ class CompanyIntelligence:
 class ResumeJobScorer:
     """Main scoring engine implementing industry best practices"""
     
-    def __init__(self):
+    # Parsed job profiles kept for reuse across requests, keyed by job ID
+    JOB_PROFILE_CACHE_SIZE = 1000
+    
+    # Stored resume/job profiles; set PROFILE_STORE_DIR="" to keep them in memory only
+    DEFAULT_PROFILE_DIR = str(Path(__file__).parent / '.profiles')
+    
+    def __init__(self, cache: Optional[ResultCache] = None,
+                 profile_store: Optional[ProfileStore] = None):
         self.semantic_matcher = SemanticMatcher()
-        self.cache = {}  # Simple in-memory cache for deterministic results
+        # Per-requirement max-sim in the breakdown; REQUIREMENT_MATCHING=0 skips it
+        self.match_requirements = os.environ.get('REQUIREMENT_MATCHING', '1') != '0'
+        # Bounded LRU cache for deterministic results
+        self.cache = cache if cache is not None else ResultCache.from_env()
+        self.job_profiles = ResultCache(max_entries=self.JOB_PROFILE_CACHE_SIZE)
+        self.profile_store = profile_store or ProfileStore(
+            os.environ.get('PROFILE_STORE_DIR', self.DEFAULT_PROFILE_DIR)
+        )
+    
+    def profile_job(self, job_text: str, job_id: Optional[str] = None) -> JobProfile:
+        """
+        Parse a job description once into a reusable JobProfile
+        
+        Profiles are cached by job_id (or by content hash when no ID is given);
+        a cached profile whose text no longer matches is rebuilt.
+        """
+        profile_key = job_id or hashlib.md5(job_text.encode()).hexdigest()
+        profile = self.job_profiles.get(profile_key)
+        if profile is not None and profile.text == job_text:
+            return profile
+        
+        profile = self._build_job_profile(job_text, job_id)
+        self.job_profiles[profile_key] = profile
+        return profile
     
-    def score(self, resume_text: str, job_text: str, company_name: str = "unknown") -> ScoringResult:
+    def _build_job_profile(self, job_text: str, job_id: Optional[str] = None, 
+                           embed: bool = True) -> JobProfile:
+        """Run every job-side extraction step (embedding and requirement vectors only with embed)"""
+        lines, line_vectors = (self.semantic_matcher.requirement_vectors(job_text)
+                               if embed and self.match_requirements else ((), None))
+        return JobProfile(
+            text=job_text,
+            skills=self._extract_skills(job_text),
+            experience=ExperienceAnalyzer.extract_experience(job_text),
+            features=self.semantic_matcher.document_features(job_text),
+            embedding=self.semantic_matcher.embed_job(job_text) if embed else None,
+            job_id=job_id,
+            requirement_lines=tuple(lines),
+            requirement_vectors=line_vectors
+        )
+    
+    def profile_resume(self, resume_text: str, resume_id: Optional[str] = None) -> ResumeProfile:
+        """Extract every resume-side feature once so the resume can be stored and rescored"""
+        return self._build_resume_profile(resume_text, resume_id)
+    
+    def _build_resume_profile(self, resume_text: str, resume_id: Optional[str] = None,
+                              embed: bool = True) -> ResumeProfile:
+        """Run every resume-side extraction step (embedding and chunk vectors only with embed)"""
+        return ResumeProfile(
+            text=resume_text,
+            skills=self._extract_skills(resume_text),
+            experience=ExperienceAnalyzer.extract_experience(resume_text),
+            features=self.semantic_matcher.document_features(resume_text),
+            embedding=self.semantic_matcher.embed_resume(resume_text) if embed else None,
+            resume_id=resume_id,
+            chunk_vectors=(self.semantic_matcher.chunk_vectors(resume_text)
+                           if embed and self.match_requirements else None)
+        )
+    
+    @timed('score')
+    def score(self, resume: Union[str, ResumeProfile], job: Union[str, JobProfile], 
+              company_name: str = "unknown", degraded: bool = False) -> ScoringResult:
         """
         Calculate comprehensive resume-job match score
         
+        Either side may be raw text or a precomputed profile (profile_resume(),
+        profile_job()); with both profiles scoring is pure vector and set math.
+        With degraded (load shedding) a cached result is still returned, but
+        otherwise nothing is encoded, requirement matching is skipped and the
+        result, flagged in its breakdown, is not cached.
         Returns score between 0-100 with detailed breakdown
         """
+        resume_text = resume.text if isinstance(resume, ResumeProfile) else resume
+        job_text = job.text if isinstance(job, JobProfile) else job
+        
         # Create cache key for deterministic results
         cache_key = self._create_cache_key(resume_text, job_text, company_name)
         
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get(cache_key)
+        CACHE_REQUESTS.inc('result', 'miss' if cached is None else 'hit')
+        if cached is not None:
+            return cached
         
         try:
-            # 1. Extract structured data
-            resume_skills = self._extract_skills(resume_text)
-            job_skills = self._extract_skills(job_text)
-            resume_exp = ExperienceAnalyzer.extract_experience(resume_text)
-            job_exp = ExperienceAnalyzer.extract_experience(job_text)
+            # 1. Extract structured data (embeddings are left to the combined encode below)
+            job_profile = job if isinstance(job, JobProfile) else self._build_job_profile(job_text, embed=False)
+            resume_profile = (resume if isinstance(resume, ResumeProfile) 
+                              else self._build_resume_profile(resume_text, embed=False))
             
             # 2. Calculate semantic similarity
-            semantic_sim, sem_confidence, method = self.semantic_matcher.calculate_similarity(
-                resume_text, job_text
+            semantic = self.semantic_matcher.calculate_similarity(
+                resume_text, job_text,
+                resume_embedding=resume_profile.embedding,
+                job_embedding=job_profile.embedding,
+                resume_features=resume_profile.features,
+                job_features=job_profile.features,
+                cached_only=degraded
             )
+            requirements = [] if degraded else self._requirement_matches([resume_profile], job_profile)[0]
             
-            # 3. Calculate skills match
-            skills_score = self._calculate_skills_match(resume_skills, job_skills)
-            
-            # 4. Calculate experience match
-            exp_score = self._calculate_experience_match(resume_exp, job_exp)
-            
-            # 5. Get company adjustment
-            company_adj, company_desc = CompanyIntelligence.get_company_adjustment(company_name)
-            
-            # 6. Combine scores with adjusted weights (fixing semantic issues)
-            base_score = (
-                skills_score * 0.60 +      # Increase skills weight
-                semantic_sim * 0.20 +      # Decrease semantic weight until fixed
-                exp_score * 0.20           # Keep experience weight
+            result = self._build_result(
+                resume_profile.skills, job_profile.skills, 
+                resume_profile.experience, job_profile.experience,
+                semantic, company_name, requirements, degraded=degraded
             )
-            # Apply confidence weighting
-            confidence_weighted = base_score * sem_confidence
             
-            # Apply company adjustment
-            final_score = max(0, min(1, confidence_weighted + company_adj))
-            
-            # Convert to 0-100 scale
-            final_score_100 = final_score * 100
-            
-            # Create comprehensive result
-            result = ScoringResult(
-                overall_score=base_score * 100,
-                confidence=sem_confidence,
-                skills_match=skills_score * 100,
-                experience_match=exp_score * 100,
-                semantic_similarity=semantic_sim * 100,
-                company_adjustment=company_adj * 100,
-                final_score=final_score_100,
-                explanation=self._generate_explanation(
-                    skills_score, semantic_sim, exp_score, 
-                    company_adj, method, sem_confidence
-                ),
-                breakdown={
-                    'resume_skills': resume_skills,
-                    'job_skills': job_skills,
-                    'resume_experience': resume_exp.__dict__,
-                    'job_experience': job_exp.__dict__,
-                    'company_info': company_desc,
-                    'method_used': method
-                }
-            )
-            
-            # Cache result
-            self.cache[cache_key] = result
+            # Cache result; degraded ones are recomputed (or backfilled) precisely later
+            if not degraded:
+                self.cache[cache_key] = result
             return result
             
         except Exception as e:
             logger.error(f"Scoring failed: {e}")
             return self._create_fallback_result()
     
-    def _extract_skills(self, text: str) -> Dict[str, List[SkillMatch]]:
-        """Extract and categorize skills using taxonomy"""
-        skills_by_category = {}
-        text_lower = text.lower()
+    @timed('score_many')
+    def score_many(self, resumes: List[Union[str, ResumeProfile]], job: Union[str, JobProfile], 
+                   company_name: str = "unknown", degraded: bool = False) -> List[Tuple[int, ScoringResult]]:
+        """
+        Score many resumes against one job in a single pass
         
-        for category, category_data in SkillTaxonomy.CATEGORIES.items():
-            category_skills = []
-            
-            for canonical_skill, aliases in category_data['skills'].items():
-                # Check for exact matches
-                all_variants = [canonical_skill] + aliases
-                
-                for variant in all_variants:
-                    if variant in text_lower:
-                        # Calculate confidence based on context
-                        confidence = self._calculate_skill_confidence(text_lower, variant)
-                        
-                        skill_match = SkillMatch(
-                            skill=canonical_skill,
-                            confidence=confidence,
-                            source='exact' if variant == canonical_skill else 'normalized'
-                        )
-                        category_skills.append(skill_match)
-                        break  # Don't double-count
+        The job is parsed and embedded once and resumes without a stored
+        profile are encoded in batches (or, when degraded, not encoded at all).
+        Returns (input_index, result) pairs ranked by final score, best first.
+        """
+        BATCH_SIZE.observe(len(resumes), 'score_many')
+        job_text = job.text if isinstance(job, JobProfile) else job
+        results: Dict[int, ScoringResult] = {}
+        pending: List[Tuple[int, Union[str, ResumeProfile], str]] = []
+        
+        for index, resume in enumerate(resumes):
+            resume_text = resume.text if isinstance(resume, ResumeProfile) else resume
+            cache_key = self._create_cache_key(resume_text, job_text, company_name)
+            cached = self.cache.get(cache_key)
+            CACHE_REQUESTS.inc('result', 'miss' if cached is None else 'hit')
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, resume, cache_key))
+        
+        if pending:
+            try:
+                job_profile = (job if isinstance(job, JobProfile)
+                               else self._build_job_profile(job_text, embed=not degraded))
+                profiles = [
+                    resume if isinstance(resume, ResumeProfile) 
+                    else self._build_resume_profile(resume, embed=False)
+                    for _, resume, _ in pending
+                ]
+                similarities = self.semantic_matcher.calculate_similarity_many(
+                    [profile.text for profile in profiles], job_text,
+                    resume_embeddings=[profile.embedding for profile in profiles],
+                    resume_features=[profile.features for profile in profiles],
+                    job_embedding=job_profile.embedding,
+                    job_features=job_profile.features,
+                    cached_only=degraded
+                )
+                requirements = ([[] for _ in profiles] if degraded
+                                else self._requirement_matches(profiles, job_profile))
+                skills_scores = SkillMatrix.match_many([profile.skills for profile in profiles], job_profile.skills)
+                exp_scores = ExperienceColumns.from_profiles(
+                    [profile.experience for profile in profiles]
+                ).match_scores(job_profile.experience).tolist()
+            except Exception as e:
+                logger.error(f"Batch scoring failed: {e}")
+                for index, _, _ in pending:
+                    results[index] = self._create_fallback_result()
+                pending, profiles, similarities, requirements, skills_scores, exp_scores = [], [], [], [], [], []
             
-            skills_by_category[category] = category_skills
+            for (index, _, cache_key), profile, semantic, matches, skills_score, exp_score in zip(
+                    pending, profiles, similarities, requirements, skills_scores, exp_scores):
+                try:
+                    result = self._build_result(
+                        profile.skills, job_profile.skills,
+                        profile.experience, job_profile.experience,
+                        semantic, company_name, matches, skills_score, exp_score, degraded
+                    )
+                    if not degraded:
+                        self.cache[cache_key] = result
+                except Exception as e:
+                    logger.error(f"Scoring failed for resume {index}: {e}")
+                    result = self._create_fallback_result()
+                results[index] = result
         
-        return skills_by_category
+        # Rank best first; ties keep submission order
+        return sorted(results.items(), key=lambda item: (-item[1].final_score, item[0]))
+    
+    @timed('requirements')
+    def _requirement_matches(self, resumes: List[ResumeProfile], job: JobProfile) -> List[List[Tuple[str, float]]]:
+        """Requirement-line max-sim per resume, reusing profiles' stored vectors; empty lists when disabled or on failure"""
+        if self.match_requirements:
+            try:
+                return self.semantic_matcher.match_requirements(
+                    [resume.text for resume in resumes], job.text,
+                    resume_chunk_vectors=[resume.chunk_vectors for resume in resumes],
+                    requirements=((list(job.requirement_lines), job.requirement_vectors)
+                                  if job.requirement_vectors is not None else None)
+                )
+            except Exception as e:
+                logger.warning(f"Requirement matching failed: {e}")
+        return [[] for _ in resumes]
     
-    def _calculate_skill_confidence(self, text: str, skill: str) -> float:
+    def _build_result(self, resume_skills: Dict, job_skills: Dict,
+                      resume_exp: ExperienceProfile, job_exp: ExperienceProfile,
+                      semantic: Tuple[float, float, str], company_name: str,
+                      requirement_matches: Optional[List[Tuple[str, float]]] = None,
+                      skills_score: Optional[float] = None,
+                      exp_score: Optional[float] = None,
+                      degraded: bool = False) -> ScoringResult:
+        """Combine extracted features and semantic similarity into a scored result"""
+        semantic_sim, sem_confidence, method = semantic
+        SIMILARITY_METHOD.inc(method.split('(')[0])
+        
+        # 3. Calculate skills match (unless already computed for a whole batch)
+        if skills_score is None:
+            skills_score = self._calculate_skills_match(resume_skills, job_skills)
+        
+        # 4. Calculate experience match
+        if exp_score is None:
+            exp_score = self._calculate_experience_match(resume_exp, job_exp)
+        
+        # 5. Get company adjustment
+        company_adj, company_desc = CompanyIntelligence.get_company_adjustment(company_name)
+        
+        # 6. Combine scores with adjusted weights (fixing semantic issues)
+        base_score = (
+            skills_score * 0.60 +      # Increase skills weight
+            semantic_sim * 0.20 +      # Decrease semantic weight until fixed
+            exp_score * 0.20           # Keep experience weight
+        )
+        # Apply confidence weighting
+        confidence_weighted = base_score * sem_confidence
+        
+        # Apply company adjustment
+        final_score = max(0, min(1, confidence_weighted + company_adj))
+        
+        # Convert to 0-100 scale
+        final_score_100 = final_score * 100
+        
+        # Create comprehensive result
+        return ScoringResult(
+            overall_score=base_score * 100,
+            confidence=sem_confidence,
+            skills_match=skills_score * 100,
+            experience_match=exp_score * 100,
+            semantic_similarity=semantic_sim * 100,
+            company_adjustment=company_adj * 100,
+            final_score=final_score_100,
+            explanation=self._generate_explanation(
+                skills_score, semantic_sim, exp_score, 
+                company_adj, method, sem_confidence
+            ),
+            breakdown={
+                'resume_skills': resume_skills,
+                'job_skills': job_skills,
+                'resume_experience': asdict(resume_exp),
+                'job_experience': asdict(job_exp),
+                'company_info': company_desc,
+                'method_used': method,
+                'degraded': degraded,
+                'requirement_matches': requirement_matches or []
+            }
+        )
+    
+    @timed('skills')
+    def _extract_skills(self, text: str) -> PackedSkills:
+        """Extract and categorize skills using taxonomy"""
+        return PackedSkills.from_hits(SkillExtractor.find_skills(text), self._calculate_skill_confidence)
+    
+    def _calculate_skill_confidence(self, skill_count: int) -> float:
         """Calculate confidence for skill detection"""
         # Basic implementation - can be enhanced with context analysis
-        skill_count = text.count(skill)
         context_score = 0.5
         
         # Boost confidence for skills mentioned multiple times
@@ -563,12 +1600,12 @@ class ResumeJobScorer:
     def _calculate_skills_match(self, resume_skills: Dict, job_skills: Dict) -> float:
         """Calculate weighted skills match score"""
         total_score = 0.0
+        resume_skills, job_skills = PackedSkills.of(resume_skills), PackedSkills.of(job_skills)
         
-        for category in SkillTaxonomy.CATEGORIES:
-            category_weight = SkillTaxonomy.CATEGORIES[category]['weight']
+        for category, category_weight in SkillTaxonomy.WEIGHT_INDEX.items():
             
-            resume_category_skills = {s.skill for s in resume_skills.get(category, [])}
-            job_category_skills = {s.skill for s in job_skills.get(category, [])}
+            resume_category_skills = set(resume_skills.names(category))
+            job_category_skills = set(job_skills.names(category))
             
             if job_category_skills:
                 # Calculate intersection ratio
@@ -620,32 +1657,21 @@ class ResumeJobScorer:
     def _calculate_level_match(self, resume_level: ExperienceLevel, 
                              job_level: ExperienceLevel) -> float:
         """Calculate seniority level match score"""
-        level_hierarchy = [
-            ExperienceLevel.ENTRY,
-            ExperienceLevel.JUNIOR,
-            ExperienceLevel.MID,
-            ExperienceLevel.SENIOR,
-            ExperienceLevel.LEAD,
-            ExperienceLevel.PRINCIPAL,
-            ExperienceLevel.EXECUTIVE
-        ]
-        
-        try:
-            resume_idx = level_hierarchy.index(resume_level)
-            job_idx = level_hierarchy.index(job_level)
-            
-            if resume_idx == job_idx:
-                return 1.0  # Perfect match
-            elif resume_idx == job_idx + 1:
-                return 0.9  # Slightly overqualified (good)
-            elif resume_idx == job_idx - 1:
-                return 0.8  # Slightly underqualified (acceptable)
-            elif resume_idx > job_idx:
-                return 0.6  # Overqualified (might not be interested)
-            else:
-                return 0.4  # Underqualified
-        except ValueError:
+        resume_idx = LEVEL_ORDER.get(resume_level)
+        job_idx = LEVEL_ORDER.get(job_level)
+        if resume_idx is None or job_idx is None:
             return 0.5  # Unknown levels
+        
+        if resume_idx == job_idx:
+            return 1.0  # Perfect match
+        elif resume_idx == job_idx + 1:
+            return 0.9  # Slightly overqualified (good)
+        elif resume_idx == job_idx - 1:
+            return 0.8  # Slightly underqualified (acceptable)
+        elif resume_idx > job_idx:
+            return 0.6  # Overqualified (might not be interested)
+        else:
+            return 0.4  # Underqualified
     
     def _create_cache_key(self, resume_text: str, job_text: str, company_name: str) -> str:
         """Create deterministic cache key"""
@@ -679,22 +1705,317 @@ class ResumeJobScorer:
 
 # Initialize global scorer instance
 _scorer = None
+_scorer_lock = threading.Lock()
 
 def get_scorer() -> ResumeJobScorer:
     """Get or create scorer instance"""
     global _scorer
     if _scorer is None:
-        _scorer = ResumeJobScorer()
+        # Warm-up and the first requests may race to build it
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = ResumeJobScorer()
     return _scorer
 
-def calculate_advanced_score(resume_text: str, job_text: str, company_name: str) -> Dict:
+def warm_up() -> bool:
+    """Build the scorer and run a canned pair through the model; returns whether a model is loaded"""
+    return get_scorer().semantic_matcher.warm_up()
+
+def prepare_worker_process():
+    """Per-process setup for a scoring worker forked from a parent that ran get_scorer()"""
+    try:
+        import torch
+        # N single-threaded processes beat N processes fighting over every core
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    
+    if _scorer is not None:
+        matcher = _scorer.semantic_matcher
+        # Each process runs one call at a time, so there is nothing to micro-batch
+        matcher.encode_batcher = None
+        # The parent owns the on-disk store
+        matcher.embedding_store.make_read_only()
+
+def calculate_advanced_score(resume_text: str, job_text: str, company_name: str,
+                             job_id: Optional[str] = None, degraded: bool = False) -> Dict:
     """
     Main entry point for scoring - maintains compatibility with existing API
+    
+    With a job_id the parsed job profile is cached and reused across calls.
+    degraded skips transformer inference (see ResumeJobScorer.score).
+    """
+    scorer = get_scorer()
+    job = _job_for_scoring(scorer, job_text, job_id, degraded)
+    result = scorer.score(resume_text, job, company_name, degraded)
+    return _format_result(result)
+
+def calculate_batch_scores(resume_texts: List[str], job_text: str, company_name: str,
+                           job_id: Optional[str] = None, degraded: bool = False) -> List[Dict]:
+    """
+    Batch entry point - scores every resume against one job, ranked best first
+    """
+    scorer = get_scorer()
+    job = _job_for_scoring(scorer, job_text, job_id, degraded)
+    ranked = scorer.score_many(resume_texts, job, company_name, degraded)
+    
+    return [
+        {'index': index, 'rank': rank, **_format_result(result)}
+        for rank, (index, result) in enumerate(ranked, start=1)
+    ]
+
+def calculate_pair_scores(pairs: List[Tuple[str, str, str, Optional[str]]]) -> List[Dict]:
+    """
+    Score independent (resume_text, job_text, company_name, job_id) pairs, in input order
+    
+    Pairs sharing a job are scored together with score_many, so each distinct
+    job is parsed and embedded once and its resumes are batch-encoded.
+    """
+    scorer = get_scorer()
+    groups: Dict[Tuple[str, str, Optional[str]], List[int]] = {}
+    for position, (_, job_text, company_name, job_id) in enumerate(pairs):
+        groups.setdefault((job_text, company_name, job_id), []).append(position)
+    
+    results: List[Optional[Dict]] = [None] * len(pairs)
+    for (job_text, company_name, job_id), positions in groups.items():
+        job = _job_for_scoring(scorer, job_text, job_id, False)
+        ranked = scorer.score_many([pairs[position][0] for position in positions], job, company_name)
+        for index, result in ranked:
+            results[positions[index]] = _format_result(result)
+    return results
+
+def _job_for_scoring(scorer: ResumeJobScorer, job_text: str, job_id: Optional[str],
+                     degraded: bool) -> Union[str, JobProfile]:
+    """The cached job profile for job_id, built unless degraded (building one encodes the job)"""
+    if not job_id:
+        return job_text
+    if degraded:
+        profile = scorer.job_profiles.get(job_id)
+        return profile if profile is not None and profile.text == job_text else job_text
+    return scorer.profile_job(job_text, job_id)
+
+def profile_resume(resume_text: str, resume_id: Optional[str] = None) -> ResumeProfile:
+    """
+    Extract a storable ResumeProfile, usable in place of resume text when scoring
+    """
+    return get_scorer().profile_resume(resume_text, resume_id)
+
+def register_resume(resume_text: str, resume_id: Optional[str] = None) -> ResumeProfile:
+    """
+    Profile a resume at upload time, persist it under resume_id (a content
+    hash when no ID is given) and add it to the candidate search indexes
+    """
+    resume_id = resume_id or hashlib.md5(resume_text.encode()).hexdigest()
+    profile = get_scorer().profile_resume(resume_text, resume_id)
+    get_scorer().profile_store.save('resume', resume_id, profile.to_dict())
+    if profile.embedding is not None:
+        get_resume_index().add([resume_id], profile.embedding)
+    get_resume_attributes().add(
+        resume_id,
+        [match.skill for matches in profile.skills.values() for match in matches],
+        profile.experience.years
+    )
+    return profile
+
+def unregister_resume(resume_id: str) -> bool:
+    """Withdraw a resume from candidate search and the profile store"""
+    get_resume_index().remove([resume_id])
+    get_resume_attributes().remove([resume_id])
+    return get_scorer().profile_store.delete('resume', resume_id)
+
+def register_job(job_text: str, job_id: Optional[str] = None, 
+                 company_name: str = "unknown") -> JobProfile:
+    """
+    Profile an open job posting, persist it under job_id (a content hash
+    when no ID is given) and add it to the job index for recommendations
     """
+    job_id = job_id or hashlib.md5(job_text.encode()).hexdigest()
     scorer = get_scorer()
-    result = scorer.score(resume_text, job_text, company_name)
+    # A copy, so requests already holding the cached profile never see it change
+    profile = replace(scorer.profile_job(job_text, job_id), company_name=company_name)
+    scorer.job_profiles[job_id] = profile
+    scorer.profile_store.save('job', job_id, profile.to_dict())
+    if profile.embedding is not None:
+        get_job_index().add([job_id], profile.embedding)
+    return profile
+
+def unregister_job(job_id: str) -> bool:
+    """Close a posting: drop it from the job index and the profile store"""
+    get_job_index().remove([job_id])
+    get_scorer().job_profiles.discard(job_id)
+    return get_scorer().profile_store.delete('job', job_id)
+
+class ProfileNotFound(LookupError):
+    """A profile ID that was never registered (or has been deleted)"""
+
+def _require_resume_profile(resume_id: str) -> ResumeProfile:
+    profile = load_resume_profile(resume_id)
+    if profile is None:
+        raise ProfileNotFound(f"Unknown resume_id: {resume_id}")
+    return profile
+
+def _require_job_profile(job_id: str) -> JobProfile:
+    profile = load_job_profile(job_id)
+    if profile is None:
+        raise ProfileNotFound(f"Unknown job_id: {job_id}")
+    return profile
+
+def load_resume_profile(resume_id: str) -> Optional[ResumeProfile]:
+    """Load a stored resume profile, or None if unknown"""
+    document = get_scorer().profile_store.load('resume', resume_id)
+    return ResumeProfile.from_dict(document) if document is not None else None
+
+def load_job_profile(job_id: str) -> Optional[JobProfile]:
+    """Load a job profile from the in-memory cache or the store, or None if unknown"""
+    scorer = get_scorer()
+    profile = scorer.job_profiles.get(job_id)
+    if profile is not None:
+        return profile
+    document = scorer.profile_store.load('job', job_id)
+    if document is None:
+        return None
+    profile = JobProfile.from_dict(document)
+    scorer.job_profiles[job_id] = profile
+    return profile
+
+def calculate_profile_score(resume: ResumeProfile, job: JobProfile, 
+                            company_name: Optional[str] = None, degraded: bool = False) -> Dict:
+    """
+    Score stored profiles against each other - no text extraction or encoding
+    """
+    return _format_result(get_scorer().score(resume, job, company_name or job.company_name, degraded))
+
+def calculate_stored_profile_score(resume_id: str, job_id: str, company_name: Optional[str] = None,
+                                   degraded: bool = False) -> Dict:
+    """
+    Load two stored profiles by ID and score them; raises ProfileNotFound for an unknown ID
+    
+    Loading happens here rather than in the caller, so the API runs it on
+    the inference executor along with the scoring.
+    """
+    resume, job = _require_resume_profile(resume_id), _require_job_profile(job_id)
+    return calculate_profile_score(resume, job, company_name, degraded)
+
+# Retrieval indexes over registered jobs and resumes; set INDEX_DIR="" to keep them in memory only
+_job_index = None
+_resume_index = None
+_resume_attributes = None
+
+def _index_dir() -> str:
+    return os.environ.get('INDEX_DIR', str(Path(__file__).parent / '.index'))
+
+def get_job_index() -> VectorIndex:
+    """Get or create the job index"""
+    global _job_index
+    if _job_index is None:
+        _job_index = VectorIndex(_index_dir(), name='jobs')
+    return _job_index
+
+def get_resume_index() -> VectorIndex:
+    """Get or create the resume embedding index"""
+    global _resume_index
+    if _resume_index is None:
+        _resume_index = VectorIndex(_index_dir(), name='resumes')
+    return _resume_index
+
+def get_resume_attributes() -> AttributeIndex:
+    """Get or create the resume skill/years index"""
+    global _resume_attributes
+    if _resume_attributes is None:
+        _resume_attributes = AttributeIndex(_index_dir(), name='resumes')
+    return _resume_attributes
+
+def recommend_jobs(resume: Union[str, ResumeProfile], top_k: int = 20, 
+                   shortlist_size: int = 200) -> List[Dict]:
+    """
+    Best matching open jobs for a resume
     
-    # Convert to format expected by existing API
+    Retrieves a shortlist from the job index by cosine similarity, then
+    re-ranks it with the full skills, experience and company scoring.
+    """
+    scorer = get_scorer()
+    profile = resume if isinstance(resume, ResumeProfile) else scorer.profile_resume(resume)
+    if profile.embedding is None:
+        raise RuntimeError("Semantic model unavailable - job retrieval needs embeddings")
+    
+    reranked = []
+    for job_id, similarity in get_job_index().search(profile.embedding, max(top_k, shortlist_size)):
+        job = load_job_profile(job_id)
+        if job is None:
+            continue
+        result = scorer.score(profile, job, job.company_name)
+        reranked.append((job_id, similarity, result))
+    
+    # Best full score first; ties keep retrieval order
+    reranked.sort(key=lambda item: -item[2].final_score)
+    
+    return [
+        {'job_id': job_id, 'rank': rank, 'retrieval_similarity': similarity, **_format_result(result)}
+        for rank, (job_id, similarity, result) in enumerate(reranked[:top_k], start=1)
+    ]
+
+# Candidates need this share of the job's stated years to pass the prefilter,
+# the same "close enough" band used by _calculate_experience_match
+MIN_YEARS_RATIO = 0.8
+
+def search_candidates(job: Union[str, JobProfile], company_name: Optional[str] = None,
+                      top_k: int = 50, required_skills: Optional[List[str]] = None,
+                      min_years: Optional[int] = None, shortlist_size: int = 500) -> List[Dict]:
+    """
+    Best matching registered resumes for a job, in two stages
+    
+    1. Prefilter on required skills (normalized through the taxonomy) and
+       years of experience (default: MIN_YEARS_RATIO of the job's stated years)
+    2. Retrieve a shortlist of survivors by embedding similarity, then compute
+       exact scores for the shortlist only
+    """
+    scorer = get_scorer()
+    job_profile = job if isinstance(job, JobProfile) else scorer.profile_job(job)
+    if job_profile.embedding is None:
+        raise RuntimeError("Semantic model unavailable - candidate retrieval needs embeddings")
+    
+    if min_years is None:
+        min_years = int(job_profile.experience.years * MIN_YEARS_RATIO)
+    required = SkillTaxonomy.normalize_many(required_skills or [])
+    allowed = get_resume_attributes().filter(required, min_years) if required or min_years > 0 else None
+    
+    shortlist = get_resume_index().search(
+        job_profile.embedding, max(top_k, shortlist_size), allowed=allowed
+    )
+    
+    candidates = []
+    for resume_id, similarity in shortlist:
+        profile = load_resume_profile(resume_id)
+        if profile is not None:
+            candidates.append((resume_id, similarity, profile))
+    
+    ranked = scorer.score_many(
+        [profile for _, _, profile in candidates], job_profile, company_name or job_profile.company_name
+    )
+    
+    return [
+        {
+            'resume_id': candidates[index][0],
+            'rank': rank,
+            'retrieval_similarity': candidates[index][1],
+            **_format_result(result)
+        }
+        for rank, (index, result) in enumerate(ranked[:top_k], start=1)
+    ]
+
+def recommend_jobs_for_stored_resume(resume_id: str, top_k: int = 20, shortlist_size: int = 200) -> List[Dict]:
+    """recommend_jobs for a registered resume; raises ProfileNotFound for an unknown ID"""
+    return recommend_jobs(_require_resume_profile(resume_id), top_k, shortlist_size)
+
+def search_candidates_for_stored_job(job_id: str, company_name: Optional[str] = None,
+                                     top_k: int = 50, required_skills: Optional[List[str]] = None,
+                                     min_years: Optional[int] = None, shortlist_size: int = 500) -> List[Dict]:
+    """search_candidates for a registered job; raises ProfileNotFound for an unknown ID"""
+    return search_candidates(_require_job_profile(job_id), company_name, top_k,
+                             required_skills, min_years, shortlist_size)
+
+def _format_result(result: ScoringResult) -> Dict:
+    """Convert a ScoringResult to the format expected by the existing API"""
     return {
         'overall_score': int(result.overall_score),
         'semantic_similarity': result.semantic_similarity / 100,
@@ -705,15 +2026,22 @@ def calculate_advanced_score(resume_text: str, job_text: str, company_name: str)
         'experience_match': _format_experience_match(result.breakdown),
         'company_modifier': int(result.company_adjustment),
         'final_score': int(result.final_score),
-        'explanation': result.explanation
+        'explanation': result.explanation,
+        'method_used': result.breakdown.get('method_used', 'unknown'),
+        'degraded': result.breakdown.get('degraded', False),
+        'requirement_matches': [
+            {'requirement': line, 'similarity': round(similarity, 4)}
+            for line, similarity in result.breakdown.get('requirement_matches', [])
+        ]
     }
 
 def _format_skills_breakdown(resume_skills: Dict, job_skills: Dict) -> Dict:
     """Format skills data for API compatibility"""
     breakdown = {}
+    resume_skills, job_skills = PackedSkills.of(resume_skills), PackedSkills.of(job_skills)
     for category in SkillTaxonomy.CATEGORIES.keys():
-        resume_count = len(resume_skills.get(category, []))
-        job_count = len(job_skills.get(category, []))
+        resume_count = resume_skills.count(category)
+        job_count = job_skills.count(category)
         
         if job_count > 0:
             score = min(100, (resume_count / job_count) * 100)
@@ -0,0 +1,458 @@
+"""
+Serving infrastructure for the scoring API.
+
+- InferenceExecutor: dedicated, size-configurable worker pool for model
+  inference with a bounded queue (backpressure) and per-call timeouts,
+  backed by threads or by processes forked from a preloaded parent
+- MicroBatcher: coalesces concurrent small calls to a batch function (e.g.
+  the sentence encoder) into one call of up to max_batch items
+- DegradationPolicy: decides from queue depth and latency when scoring should
+  take the cheap path instead of running the transformer
+- BackfillQueue: re-runs degraded calls precisely once load allows
+"""
+
+import asyncio
+import gc
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the inference queue is full and the call was not accepted"""
+
+
+class InferenceExecutor:
+    """
+    Runs blocking scoring calls off the event loop on a dedicated pool
+
+    At most `max_workers` calls run at once and at most `max_queue` more wait;
+    anything beyond that is rejected immediately with ExecutorSaturated rather
+    than queueing unboundedly. A call that exceeds its timeout raises
+    asyncio.TimeoutError; if it had not started yet it is dropped from the queue.
+
+    With `processes=True` the workers are processes forked by `start()` after
+    `preload` has run in the parent, so model weights loaded there are shared
+    copy-on-write rather than duplicated per worker. `initializer` runs once in
+    each child. Calls and their arguments must then be picklable. Each child
+    has its own caches, so a call only warms the caches of the child that ran
+    it. If a child dies, the calls in flight fail with BrokenProcessPool and
+    the next submit forks a fresh pool.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64, processes: bool = False,
+                 preload: Optional[Callable[[], Any]] = None,
+                 initializer: Optional[Callable[[], Any]] = None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.processes = processes
+        self._preload = preload
+        self._initializer = initializer
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()  # Serializes creating and replacing the pool
+        self._in_flight = 0  # Running + queued
+
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    @classmethod
+    def from_env(cls, preload: Optional[Callable[[], Any]] = None,
+                 initializer: Optional[Callable[[], Any]] = None) -> "InferenceExecutor":
+        """
+        Build from SCORING_WORKERS and SCORING_QUEUE_SIZE
+
+        SCORING_PROCESSES > 0 selects a process pool of that many workers instead.
+        """
+        processes = int(os.environ.get("SCORING_PROCESSES", 0))
+        if processes > 0:
+            return cls(
+                max_workers=processes,
+                max_queue=int(os.environ.get("SCORING_QUEUE_SIZE", 64)),
+                processes=True, preload=preload, initializer=initializer
+            )
+        return cls(
+            max_workers=int(os.environ.get("SCORING_WORKERS", min(4, os.cpu_count() or 1))),
+            max_queue=int(os.environ.get("SCORING_QUEUE_SIZE", 64))
+        )
+
+    def start(self):
+        """Create the worker pool; for processes, preload and fork every worker now"""
+        with self._pool_lock:
+            if self._executor is not None:
+                return
+            if not self.processes:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+                return
+
+            if self._preload is not None:
+                self._preload()
+            self._fork_pool()
+
+    def _fork_pool(self):
+        # Keep the collector from touching (and so copying) the preloaded heap in children
+        gc.collect()
+        gc.freeze()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=self._initializer
+        )
+        # The first submit forks the whole pool
+        self._executor.submit(os.getpid).result()
+        logger.info(f"Forked {self.max_workers} scoring worker processes")
+
+    def _replace_broken(self, broken: Executor):
+        """Fork a new pool in place of one whose worker died (once, however many callers notice)"""
+        with self._pool_lock:
+            if self._executor is not broken:
+                return
+            logger.error("A scoring worker process died; forking a new pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.restarts += 1
+            self._fork_pool()
+
+    @property
+    def depth(self) -> int:
+        """Calls currently running or waiting"""
+        return self._in_flight
+
+    def _release(self, future: Future):
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled():
+                self.completed += 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue fn(*args) on the pool, raising ExecutorSaturated if it is full"""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(
+                    f"Inference queue full ({self._in_flight} in flight)"
+                )
+            self._in_flight += 1
+
+        try:
+            if self._executor is None:
+                self.start()
+            executor = self._executor
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._replace_broken(executor)
+                future = self._executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        # Capacity is returned when the work really finishes (or is cancelled
+        # while still queued), not when the caller stops waiting
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run fn(*args) on the pool, raising ExecutorSaturated or asyncio.TimeoutError"""
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool size, queue depth and outcome counters"""
+        with self._lock:
+            return {
+                "mode": "processes" if self.processes else "threads",
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "restarts": self.restarts
+            }
+
+    def shutdown(self):
+        """Stop accepting work and drop anything still queued; start() builds a fresh pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class MicroBatcher:
+    """
+    Groups concurrent calls to a batch function into larger batches
+
+    Each `submit(items)` joins a queue; a background thread waits up to
+    `max_wait_ms` after the first pending request (or until `max_batch` items
+    are pending), calls `fn` once on everything collected and hands each caller
+    its own slice of the output. A request is never split across batches, so
+    one larger than `max_batch` runs on its own.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], Sequence[Any]], max_batch: int = 64,
+                 max_wait_ms: float = 5.0, name: str = "micro-batcher"):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[List[Any], Future]] = deque()
+        self._pending_items = 0
+        self._thread: Optional[threading.Thread] = None
+
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, items: List[Any]) -> Future:
+        """Queue items; the future resolves to fn's output rows for them"""
+        future: Future = Future()
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.append((list(items), future))
+            self._pending_items += len(items)
+            self._cond.notify()
+        return future
+
+    def __call__(self, items: List[Any]) -> Any:
+        """Blocking submit"""
+        return self.submit(items).result()
+
+    def _take_batch(self) -> List[Tuple[List[Any], Future]]:
+        """Wait for the first request, then for the batch to fill or the window to close"""
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while self._pending_items < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, size = [], 0
+            while self._queue and (not batch or size + len(self._queue[0][0]) <= self.max_batch):
+                items, future = self._queue.popleft()
+                batch.append((items, future))
+                size += len(items)
+            self._pending_items -= size
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            requests = [(items, future) for items, future in batch if future.set_running_or_notify_cancel()]
+            if not requests:
+                continue
+
+            flat = [item for items, _ in requests for item in items]
+            try:
+                outputs = self.fn(flat)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(flat)
+            start = 0
+            for items, future in requests:
+                future.set_result(outputs[start:start + len(items)])
+                start += len(items)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch count and mean batch size so far"""
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0
+        }
+
+
+class DegradationPolicy:
+    """
+    Decides when scoring should skip transformer inference
+
+    Scoring degrades once the executor's depth reaches `max_depth` or the
+    smoothed end-to-end scoring latency reaches `max_latency_ms` (0 disables
+    either signal), and recovers only when both are back under
+    `recover_ratio` of their thresholds, so it doesn't flap at the boundary.
+    """
+
+    def __init__(self, max_depth: int = 0, max_latency_ms: float = 0.0,
+                 smoothing: float = 0.2, recover_ratio: float = 0.8):
+        self.max_depth = max_depth
+        self.max_latency_ms = max_latency_ms
+        self.smoothing = smoothing
+        self.recover_ratio = recover_ratio
+        self._lock = threading.Lock()
+        self.latency_ms = 0.0  # Exponentially weighted moving average
+        self.degraded = False
+
+        self.degraded_calls = 0
+        self.transitions = 0
+
+    @classmethod
+    def from_env(cls) -> "DegradationPolicy":
+        """Build from DEGRADE_QUEUE_DEPTH and DEGRADE_LATENCY_MS (both off by default)"""
+        return cls(
+            max_depth=int(os.environ.get("DEGRADE_QUEUE_DEPTH", 0)),
+            max_latency_ms=float(os.environ.get("DEGRADE_LATENCY_MS", 0))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_depth > 0 or self.max_latency_ms > 0
+
+    def observe(self, seconds: float):
+        """Record one scoring call's end-to-end latency"""
+        with self._lock:
+            self.latency_ms += self.smoothing * (seconds * 1000 - self.latency_ms)
+
+    def should_degrade(self, depth: int) -> bool:
+        """Whether a call arriving at this executor depth should take the cheap path"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            limit = self.recover_ratio if self.degraded else 1.0
+            overloaded = (
+                (self.max_depth > 0 and depth >= self.max_depth * limit) or
+                (self.max_latency_ms > 0 and self.latency_ms >= self.max_latency_ms * limit)
+            )
+            if overloaded != self.degraded:
+                self.degraded = overloaded
+                self.transitions += 1
+                logger.warning(f"Scoring {'degraded' if overloaded else 'recovered'} "
+                               f"(depth {depth}, latency {self.latency_ms:.0f}ms)")
+            if overloaded:
+                self.degraded_calls += 1
+            return overloaded
+
+    def stats(self) -> Dict[str, Any]:
+        """Thresholds, current state and counters"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "degraded": self.degraded,
+                "max_depth": self.max_depth,
+                "max_latency_ms": self.max_latency_ms,
+                "latency_ms": round(self.latency_ms, 1),
+                "degraded_calls": self.degraded_calls,
+                "transitions": self.transitions
+            }
+
+
+class BackfillQueue:
+    """
+    Re-runs degraded calls precisely once load allows
+
+    `add(fn, *args)` queues a call. It only counts the call's items (the
+    entries of its list arguments, e.g. a batch's resumes) and drops it when
+    `max_pending` calls or `max_pending_items` items are already waiting, so
+    the queue's memory is bounded and adding never walks the payload on the
+    caller's thread. One daemon thread runs the calls in order via `submit`,
+    which must return a Future, but only while `busy()` is False, so backfill
+    never competes with live traffic. That thread also skips calls identical
+    to one already run since the queue was last empty. On a process pool the
+    precise result is cached only by the worker that ran it.
+    """
+
+    def __init__(self, submit: Callable[..., Future], busy: Callable[[], bool],
+                 max_pending: int = 1000, max_pending_items: int = 5000, poll_interval: float = 0.5):
+        self._submit = submit
+        self._busy = busy
+        self.max_pending = max_pending
+        self.max_pending_items = max_pending_items
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[Callable[..., Any], Tuple[Any, ...], int]] = deque()
+        self._pending_items = 0
+        self._seen = set()  # Keys run since the queue was last empty
+        self._thread: Optional[threading.Thread] = None
+
+        self.completed = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.failed = 0
+
+    @staticmethod
+    def _items(args: Tuple[Any, ...]) -> int:
+        return max(1, sum(len(arg) for arg in args if isinstance(arg, (list, tuple))))
+
+    def add(self, fn: Callable[..., Any], *args: Any) -> bool:
+        """Queue fn(*args); False if the queue is full"""
+        items = self._items(args)
+        with self._cond:
+            if len(self._queue) >= self.max_pending or self._pending_items + items > self.max_pending_items:
+                self.dropped += 1
+                return False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="backfill", daemon=True)
+                self._thread.start()
+            self._queue.append((fn, args, items))
+            self._pending_items += items
+            self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._seen.clear()
+                    self._cond.wait()
+                fn, args, items = self._queue[0]
+
+            if self._busy():
+                time.sleep(self.poll_interval)
+                continue
+            key = hashlib.md5(repr((fn.__module__, fn.__qualname__, args)).encode()).hexdigest()
+            if key in self._seen:
+                self.duplicates += 1
+            else:
+                try:
+                    self._submit(fn, *args).result()
+                except ExecutorSaturated:
+                    time.sleep(self.poll_interval)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Backfill failed: {e}")
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                self._seen.add(key)
+
+            with self._cond:
+                self._queue.popleft()
+                self._pending_items -= items
+
+    def stats(self) -> Dict[str, Any]:
+        """Pending and processed backfill counts"""
+        with self._cond:
+            return {
+                "pending": len(self._queue),
+                "pending_items": self._pending_items,
+                "completed": self.completed,
+                "dropped": self.dropped,
+                "duplicates": self.duplicates,
+                "failed": self.failed
+            }
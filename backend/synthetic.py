@@ -0,0 +1,145 @@
+"""
+Deterministic synthetic resumes and job descriptions for benchmarks and load tests.
+
+The same seed always yields the same corpus, so measurements taken on
+different commits or machines see identical inputs. Documents mix real
+taxonomy skills, experience statements and section headings, so every
+scoring stage (skill and experience extraction, chunking, encoding, TF-IDF)
+does representative work; `words` sets the approximate length.
+
+Skills come from a fixed list by default; `taxonomy_vocabulary()` draws
+them from SkillTaxonomy instead, variants included, so every skill the
+scorer knows (and every spelling it normalises) shows up.
+"""
+
+import random
+from typing import List, NamedTuple, Sequence, Tuple
+
+TECHNICAL_SKILLS = (
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C++', 'Ruby', 'Kotlin', 'Swift',
+    'React', 'Angular', 'Vue', 'Django', 'Flask', 'Spring', 'Node.js', 'TensorFlow', 'PyTorch', 'pandas',
+    'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'Cassandra',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'Jenkins'
+)
+
+SOFT_SKILLS = ('leadership', 'communication', 'mentoring', 'project management')
+
+SKILLS = TECHNICAL_SKILLS + SOFT_SKILLS
+
+
+class Vocabulary(NamedTuple):
+    """Skill names the generators draw from"""
+    technical: Sequence[str]
+    soft: Sequence[str]
+
+
+DEFAULT_VOCABULARY = Vocabulary(TECHNICAL_SKILLS, SOFT_SKILLS)
+
+ROLES = (
+    'Software Engineer', 'Backend Developer', 'Frontend Engineer', 'Data Scientist', 'DevOps Engineer',
+    'Machine Learning Engineer', 'Full Stack Developer', 'Site Reliability Engineer', 'Engineering Manager'
+)
+
+SENIORITY = ('Junior', '', 'Senior', 'Lead', 'Principal')
+
+COMPANIES = ('google', 'stripe', 'early-stage startup', 'deloitte', 'acme corp', 'unknown')
+
+_RESUME_SENTENCES = (
+    "Built and operated {skill_a} services handling {number}k requests per day.",
+    "Designed a data pipeline in {skill_a} and {skill_b} that cut processing time by {percent}%.",
+    "Led a team of {team} engineers delivering a {skill_a} platform migration.",
+    "Mentored {team} junior developers and ran code reviews for the {skill_b} codebase.",
+    "Implemented CI/CD with {skill_a} and {skill_b}, improving deployment frequency by {percent}%.",
+    "Responsible for on-call, monitoring and incident response across {number} production systems.",
+    "Developed REST and GraphQL APIs in {skill_a} backed by {skill_b}.",
+    "Managed cloud infrastructure on {skill_a} using {skill_b} for infrastructure as code."
+)
+
+_JOB_SENTENCES = (
+    "Experience with {skill_a} and {skill_b} in production.",
+    "You will design, build and operate services in {skill_a}.",
+    "Strong knowledge of {skill_a}; familiarity with {skill_b} is a plus.",
+    "Collaborate with product and design to ship features used by {number}k customers.",
+    "Own reliability, testing and observability for {skill_a} systems.",
+    "Mentor engineers and contribute to technical direction."
+)
+
+
+def taxonomy_vocabulary() -> Vocabulary:
+    """Every SkillTaxonomy skill and variant, soft skills kept apart"""
+    from scoring import SkillTaxonomy
+
+    technical, soft = [], []
+    for category, data in SkillTaxonomy.CATEGORIES.items():
+        names = soft if category == 'soft_skills' else technical
+        for skill, variants in data['skills'].items():
+            names.append(skill)
+            names.extend(variants)
+    return Vocabulary(tuple(technical), tuple(soft))
+
+
+def _fill(template: str, rng: random.Random, vocabulary: Vocabulary = DEFAULT_VOCABULARY) -> str:
+    skill_a, skill_b = rng.sample(vocabulary.technical, 2)
+    return template.format(
+        skill_a=skill_a, skill_b=skill_b, number=rng.randint(1, 900),
+        percent=rng.randint(5, 80), team=rng.randint(2, 12)
+    )
+
+
+def _paragraph(templates: Tuple[str, ...], words: int, rng: random.Random,
+               vocabulary: Vocabulary = DEFAULT_VOCABULARY) -> str:
+    """Sentences from templates until roughly `words` words"""
+    sentences, count = [], 0
+    while count < words:
+        sentence = _fill(rng.choice(templates), rng, vocabulary)
+        sentences.append(sentence)
+        count += len(sentence.split())
+    return ' '.join(sentences)
+
+
+def generate_resume(rng: random.Random, words: int = 300, vocabulary: Vocabulary = DEFAULT_VOCABULARY) -> str:
+    """One resume of roughly `words` words with summary, experience and skills sections"""
+    years = rng.randint(0, 20)
+    title = f"{rng.choice(SENIORITY)} {rng.choice(ROLES)}".strip()
+    skills = rng.sample(tuple(vocabulary.technical) + tuple(vocabulary.soft), rng.randint(4, 12))
+    summary = f"{title} with {years} years of experience in {', '.join(skills[:3])}."
+    experience = _paragraph(_RESUME_SENTENCES, max(words - len(summary.split()) - len(skills) - 4, 10),
+                            rng, vocabulary)
+    return f"Summary\n{summary}\n\nExperience\n{experience}\n\nSkills\n{', '.join(skills)}"
+
+
+def generate_job(rng: random.Random, words: int = 150, vocabulary: Vocabulary = DEFAULT_VOCABULARY) -> str:
+    """One job description of roughly `words` words with a requirements section"""
+    years = rng.randint(1, 10)
+    title = f"{rng.choice(SENIORITY)} {rng.choice(ROLES)}".strip()
+    intro = f"We are hiring a {title} to join our team."
+    requirements = [f"- {years}+ years of professional experience"]
+    requirements += [f"- {_fill(rng.choice(_JOB_SENTENCES), rng, vocabulary)}"
+                     for _ in range(max((words - len(intro.split())) // 10, 2))]
+    return f"{intro}\n\nRequirements\n" + '\n'.join(requirements)
+
+
+def generate_resumes(count: int, words: int = 300, seed: int = 0,
+                     vocabulary: Vocabulary = DEFAULT_VOCABULARY) -> List[str]:
+    """`count` resumes; the same seed always gives the same list"""
+    rng = random.Random(seed)
+    return [generate_resume(rng, words, vocabulary) for _ in range(count)]
+
+
+def generate_jobs(count: int, words: int = 150, seed: int = 0,
+                  vocabulary: Vocabulary = DEFAULT_VOCABULARY) -> List[str]:
+    """`count` job descriptions; the same seed always gives the same list"""
+    rng = random.Random(seed + 1)
+    return [generate_job(rng, words, vocabulary) for _ in range(count)]
+
+
+def generate_pairs(count: int, resume_words: int = 300, job_words: int = 150,
+                   distinct_jobs: int = 20, seed: int = 0,
+                   vocabulary: Vocabulary = DEFAULT_VOCABULARY) -> List[Tuple[str, str, str]]:
+    """(resume, job, company) triples; jobs repeat across pairs as they do in real traffic"""
+    rng = random.Random(seed + 2)
+    jobs = generate_jobs(distinct_jobs, job_words, seed, vocabulary)
+    companies = [rng.choice(COMPANIES) for _ in jobs]
+    resumes = generate_resumes(count, resume_words, seed, vocabulary)
+    picks = [rng.randrange(len(jobs)) for _ in range(count)]
+    return [(resume, jobs[pick], companies[pick]) for resume, pick in zip(resumes, picks)]
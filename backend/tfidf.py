@@ -0,0 +1,211 @@
+"""
+Corpus-fitted TF-IDF model for the lexical fallback and hybrid blending.
+
+The vectorizer is fitted once on a reference corpus and persisted as
+`<directory>/vectorizer.json` (vocabulary, IDF weights and settings); at
+runtime it is only ever applied with `transform`, which is read-only and so
+safe to share across threads. Rows come out L2-normalised, so cosine
+similarity is a sparse dot product and scoring many resumes against one job
+is a single sparse matrix-vector product.
+
+Fit on your own corpus with `python tfidf.py fit resumes.jsonl jobs/`.
+Without a fitted model the scorer fits one on a small built-in seed corpus
+(plus the skill taxonomy) on first use and persists it.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Persisted model; set TFIDF_MODEL_DIR="" to keep it in memory only
+DEFAULT_MODEL_DIR = str(Path(__file__).parent / '.tfidf')
+
+MODEL_FILE = 'vectorizer.json'
+
+# Settings shared by fitting and the rebuilt runtime vectorizer
+VECTORIZER_SETTINGS = {
+    'stop_words': 'english',
+    'ngram_range': (1, 3),  # Include trigrams for technical terms
+    'lowercase': True
+}
+
+# Generic resume and job description text, so common professional vocabulary
+# gets a low IDF and specific skills and domains stand out
+SEED_CORPUS = (
+    "Software engineer with 5 years of experience building backend services in Python and Django. "
+    "Designed REST APIs, wrote unit tests and deployed to AWS.",
+    "Senior frontend developer experienced in React, TypeScript and modern CSS. Led the migration "
+    "of a legacy application and mentored junior developers.",
+    "Data scientist with a background in statistics and machine learning. Built forecasting models "
+    "in Python with pandas and scikit-learn and presented results to stakeholders.",
+    "DevOps engineer responsible for CI/CD pipelines, Kubernetes clusters and infrastructure as code "
+    "with Terraform. Improved deployment frequency and reduced incident response time.",
+    "Entry level developer and recent computer science graduate. Completed internships and personal "
+    "projects in Java and JavaScript.",
+    "Engineering manager who managed a team of 8 engineers, ran hiring and planning, and delivered "
+    "a payments platform on schedule.",
+    "Mobile developer with experience shipping iOS and Android apps in Swift and Kotlin.",
+    "Database administrator experienced with PostgreSQL and MySQL performance tuning, backups and replication.",
+    "We are hiring a backend engineer to design and build scalable services. Requirements: 3+ years "
+    "of experience with Python or Go, SQL databases and cloud platforms.",
+    "Join our team as a frontend engineer. You will build responsive user interfaces in React and "
+    "collaborate with designers and product managers.",
+    "We are looking for a machine learning engineer to train, evaluate and deploy models in production. "
+    "Experience with PyTorch or TensorFlow is required.",
+    "Site reliability engineer wanted to own monitoring, on-call and capacity planning for our "
+    "Kubernetes infrastructure on Google Cloud.",
+    "Seeking a senior Java developer with Spring Boot and microservices experience for our "
+    "financial services client.",
+    "Startup looking for a full stack developer comfortable with Node.js, React and MongoDB. "
+    "Strong communication skills and ownership mindset.",
+    "Junior data analyst role: build dashboards, write SQL queries and support reporting for the "
+    "operations team.",
+    "Principal engineer to set technical direction, lead architecture reviews and mentor senior staff "
+    "across multiple teams."
+)
+
+
+class TfidfModel:
+    """Fitted TF-IDF vectorizer used for transform and cosine similarity only"""
+
+    def __init__(self, vectorizer):
+        self.vectorizer = vectorizer
+
+    @classmethod
+    def fit(cls, documents: Iterable[str], max_features: int = 10000,
+            min_df: int = 1, max_df: float = 0.95) -> "TfidfModel":
+        """Fit vocabulary and IDF weights on a reference corpus"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer(
+            max_features=max_features, min_df=min_df, max_df=max_df, **VECTORIZER_SETTINGS
+        )
+        vectorizer.fit(list(documents))
+        return cls(vectorizer)
+
+    @classmethod
+    def load(cls, directory: str) -> "TfidfModel":
+        """Rebuild a persisted model without refitting"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        with open(Path(directory) / MODEL_FILE, 'r') as f:
+            state = json.load(f)
+        vectorizer = TfidfVectorizer(vocabulary=state['vocabulary'], **VECTORIZER_SETTINGS)
+        vectorizer.idf_ = np.asarray(state['idf'], dtype=np.float64)
+        return cls(vectorizer)
+
+    def save(self, directory: str):
+        """Write vocabulary and IDF weights to `<directory>/vectorizer.json`"""
+        path = Path(directory) / MODEL_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'vocabulary': {term: int(column) for term, column in self.vectorizer.vocabulary_.items()},
+                'idf': self.vectorizer.idf_.tolist()
+            }, f)
+        os.replace(tmp_path, path)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.vectorizer.vocabulary_)
+
+    def transform(self, texts: Sequence[str]):
+        """Sparse CSR matrix of L2-normalised TF-IDF rows, one per text"""
+        return self.vectorizer.transform(texts)
+
+    def similarity(self, resume_text: str, job_text: str) -> float:
+        """Cosine similarity of two texts"""
+        return float(self.similarity_many([resume_text], job_text)[0])
+
+    def similarity_many(self, resume_texts: Sequence[str], job_text: str) -> np.ndarray:
+        """Cosine similarity of every resume against one job, as one sparse product"""
+        matrix = self.transform(list(resume_texts) + [job_text])
+        # Rows are unit length (or all-zero), so the dot product is the cosine
+        return np.asarray((matrix[:-1] @ matrix[-1].T).todense()).ravel()
+
+
+def load_or_fit(directory: Optional[str] = None, seed_documents: Sequence[str] = ()) -> TfidfModel:
+    """
+    The persisted model, or one fitted on the seed corpus (and persisted) if none exists
+
+    `directory` defaults to TFIDF_MODEL_DIR; an empty directory means no persistence.
+    """
+    if directory is None:
+        directory = os.environ.get('TFIDF_MODEL_DIR', DEFAULT_MODEL_DIR)
+
+    if directory and (Path(directory) / MODEL_FILE).exists():
+        try:
+            return TfidfModel.load(directory)
+        except Exception as e:
+            logger.warning(f"Could not load TF-IDF model from {directory} ({e}); refitting")
+
+    model = TfidfModel.fit([*SEED_CORPUS, *seed_documents])
+    logger.info(f"Fitted TF-IDF model on the seed corpus ({model.vocabulary_size} terms)")
+    if directory:
+        try:
+            model.save(directory)
+        except OSError as e:
+            logger.warning(f"Could not persist TF-IDF model to {directory}: {e}")
+    return model
+
+
+def read_corpus(paths: Iterable[str]) -> List[str]:
+    """
+    Documents from files: one per .txt file (directories are searched for
+    *.txt), one per line of .jsonl (its "text" field)
+    """
+    documents = []
+    for name in paths:
+        path = Path(name)
+        files = sorted(path.rglob('*.txt')) if path.is_dir() else [path]
+        for file in files:
+            if file.suffix == '.jsonl':
+                with open(file, 'r') as f:
+                    documents.extend(json.loads(line)['text'] for line in f if line.strip())
+            else:
+                documents.append(file.read_text())
+    return [document for document in documents if document.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fit and inspect the persisted TF-IDF model")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    fit = subcommands.add_parser('fit', help="Fit on a reference corpus and persist")
+    fit.add_argument('corpus', nargs='+', help=".txt files, directories of them, or .jsonl with a text field")
+    fit.add_argument('--output', default=None, help="Model directory (default: TFIDF_MODEL_DIR or .tfidf)")
+    fit.add_argument('--max-features', type=int, default=10000)
+    fit.add_argument('--min-df', type=int, default=1)
+    fit.add_argument('--max-df', type=float, default=0.95)
+    fit.add_argument('--no-seed', action='store_true', help="Fit on the given corpus only")
+
+    info = subcommands.add_parser('info', help="Show the persisted model")
+    info.add_argument('--output', default=None)
+    args = parser.parse_args(argv)
+
+    directory = args.output or os.environ.get('TFIDF_MODEL_DIR') or DEFAULT_MODEL_DIR
+    if args.command == 'info':
+        model = TfidfModel.load(directory)
+        print(json.dumps({'directory': directory, 'terms': model.vocabulary_size}, indent=2))
+        return 0
+
+    documents = read_corpus(args.corpus)
+    if not args.no_seed:
+        documents.extend(SEED_CORPUS)
+    model = TfidfModel.fit(documents, args.max_features, args.min_df, args.max_df)
+    model.save(directory)
+    print(json.dumps({'directory': directory, 'documents': len(documents),
+                      'terms': model.vocabulary_size}, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())